@@ -29,7 +29,7 @@ _nowhere_recc = dedent("""\
     implement custom code for integrity and authenticity verification.
 """)
 
-_all_versions = (0.0, 9999.99)
+_all_versions = ('0.0', '9999.99')
 
 _BUILTIN_DEFS = (
 
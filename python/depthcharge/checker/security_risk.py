@@ -9,11 +9,27 @@ import enum
 import json
 import re
 
+from functools import lru_cache
+
 from ..uboot import UBootVersion
 
 _BOLD_RE = re.compile(r'\*\*(?P<ident>[a-zA-Z0-9_: -]+)\*\*')
 
 
+@lru_cache(maxsize=None)
+def _parse_version(version: str) -> UBootVersion:
+    # Many risks share the same affected version bounds, so share the parsed objects.
+    return UBootVersion(version)
+
+
+def _to_version(version):
+    # UBootVersion objects are not hashable, so only strings are parsed via the cache.
+    # Anything else is left for UBootVersion.in_range() to reject.
+    if isinstance(version, str):
+        return _parse_version(version)
+    return version
+
+
 class SecurityImpact(enum.IntFlag):
     """
     Enumerated flags (:py:class:`enum.IntFlag`) that describe the impact of a :py:class:`SecurityRisk`.
@@ -92,12 +108,14 @@ class SecurityImpact(enum.IntFlag):
     address, potentially leading to execution of attacker-supplied code.
     """
 
-    # Override to achieve desired string representation
+    # Override to achieve desired string representation.
+    #
+    # This is built directly from the set bits, highest impact first, rather than
+    # by parsing repr() output. The latter is slower and its format (and member
+    # ordering) varies across Python versions.
     def __str__(self):
-        s = self.__repr__()
-        start = s.index('.') + 1
-        end = s.index(':')
-        return s[start:end].replace('|', '+')
+        value = int(self)
+        return '+'.join(name for (bit, name) in _IMPACT_NAMES if value & bit) or 'NONE'
 
     def describe(self, html=False) -> str:
         """
@@ -172,6 +190,11 @@ class SecurityImpact(enum.IntFlag):
         return ret
 
 
+# Single-bit SecurityImpact (value, name) pairs, in descending order of value.
+_IMPACT_NAMES = tuple(sorted(((int(f), f.name) for f in SecurityImpact.__members__.values()
+                              if f.value and (f.value & (f.value - 1)) == 0), reverse=True))
+
+
 class SecurityRisk:
     """
     Encapsulates information about a potential security risk.
@@ -180,6 +203,9 @@ class SecurityRisk:
         :py:class:`SecurityRisk` from another when coalescing results.
     """
 
+    __slots__ = ('_ident', '_impact', '_summary', '_source', '_description',
+                 '_recommendation', '_min_version', '_max_version', '_hash')
+
     def __init__(self, identifier, impact, source, summary, description, recommendation,
                  affected_versions: tuple = None):
         """
@@ -202,6 +228,9 @@ class SecurityRisk:
         self._min_version = None
         self._max_version = None
 
+        # The identifier is immutable, so we need only compute its hash once.
+        self._hash = hash(identifier)
+
         if not isinstance(self._impact, SecurityImpact):
             err = "Expected type SecurityImpact for 'impact', got {:s}"
             raise TypeError(err.format(type(self._impact).__name__))
@@ -221,16 +250,19 @@ class SecurityRisk:
     # This is allows us to test if a SecurityRisk is in a set, as
     # is done in the Report class.
     def __eq__(self, other) -> bool:
-        if hasattr(other, 'identifier'):
-            return self.identifier == other.identifier
+        if isinstance(other, SecurityRisk):
+            return self._ident == other._ident
 
         if isinstance(other, str):
-            return self.identifier == other
+            return self._ident == other
+
+        if hasattr(other, 'identifier'):
+            return self._ident == other.identifier
 
         return False
 
     def __hash__(self):
-        return self.identifier.__hash__()
+        return self._hash
 
     def __repr__(self):
         return self.__class__.__name__ + '<' + self.identifier + '>'
@@ -347,15 +379,19 @@ class SecurityRisk:
         """
 
         # Version is not relevant
-        if not self._min_version or not self._max_version:
+        if self._min_version is None or self._max_version is None:
             return True
 
         if isinstance(version, str):
-            version = UBootVersion(version)
+            version = _parse_version(version)
         elif isinstance(version, UBootVersion):
             pass
         else:
             err = 'Unexpected type for `version` parameter: '
             raise TypeError(err + type(version).__name__)
 
+        # Affected version bounds are parsed upon first use, and retained thereafter.
+        self._min_version = _to_version(self._min_version)
+        self._max_version = _to_version(self._max_version)
+
         return version.in_range(self._min_version, self._max_version)
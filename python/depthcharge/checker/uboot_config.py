@@ -2,7 +2,6 @@
 # Depthcharge: <https://github.com/nccgroup/depthcharge>
 
 import re
-from copy import deepcopy
 
 from . import ConfigChecker
 
@@ -59,4 +58,5 @@ class UBootConfigChecker(ConfigChecker):
 
             self._add_config_entry(key, value, source)
 
-        return deepcopy(cfg)
+        # Values are immutable (value, source) tuples; a shallow copy suffices.
+        return cfg.copy()
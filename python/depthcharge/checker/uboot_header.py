@@ -6,12 +6,18 @@ import re
 import subprocess
 import textwrap
 
-from copy import deepcopy
-from tempfile import TemporaryDirectory
+from tempfile import TemporaryDirectory, TemporaryFile
 
 from . import ConfigChecker
 from .. import log
 
+# Matches both `#define` and `#undef` lines emitted by `cpp -dD`.
+# Only one of the `def_ident` or `undef_ident` groups will be populated.
+_MACRO_RE = re.compile(
+    r'#(?:define\s+(?P<def_ident>[A-Za-z0-9_]+)(?P<args>\([A-Za-z0-9_ ,\.]*\))?\s+(?P<value>.*)'
+    r'|undef\s+(?P<undef_ident>[A-Za-z0-9_]+))'
+)
+
 
 class UBootHeaderChecker(ConfigChecker):
     """
@@ -32,7 +38,8 @@ class UBootHeaderChecker(ConfigChecker):
     their reports. (See :py:meth:`Report.merge()`.)
 
     The *include_paths* parameter should contain a list of paths to search
-    for header files when ``#include`` directives are encountered.
+    for header files when ``#include`` directives are encountered. This list is
+    copied when the checker is created; later changes to it have no effect.
 
     Should you encounter problematic header files that prevent preprocessing
     from completed, but are not of interest to you, you can specify their
@@ -60,7 +67,7 @@ class UBootHeaderChecker(ConfigChecker):
         super().__init__(uboot_version, enable_builtins)
 
         if isinstance(include_paths, list):
-            self._inc = include_paths
+            self._inc = list(include_paths)
         elif isinstance(include_paths, str):
             self._inc = [include_paths]
         else:
@@ -86,18 +93,30 @@ class UBootHeaderChecker(ConfigChecker):
 
         self._dummy_dir = None
 
+        # Preprocessor arguments that remain the same across calls to load()
+        self._static_args = []
+        for path in self._inc:
+            self._static_args.extend(('-I', path))
+
+        # We'll miss definitions in U-Boot sources originating from the Linux
+        # kernel without these.
+        self._static_args.extend(('-D__KERNEL__', '-D__UBOOT__'))
+
     def _create_dummy_headers(self):
         self._dummy_dir = TemporaryDirectory(prefix='DepthchargeDummyHeaders-')
-        for hdr in self._dummy_headers:
-            hdr_dir = os.path.dirname(hdr)
+        root = self._dummy_dir.name
 
-            # TODO: Revisit a better way to handle this input
+        # Create each unique parent directory only once.
+        # TODO: Revisit a better way to handle this input
+        hdr_dirs = {os.path.dirname(hdr) for hdr in self._dummy_headers}
+        for hdr_dir in hdr_dirs:
             if hdr_dir and '..' not in hdr_dir:
-                path = os.path.join(self._dummy_dir.name, hdr_dir)
-                os.makedirs(path, mode=0o700, exist_ok=True)
+                os.makedirs(os.path.join(root, hdr_dir), mode=0o700, exist_ok=True)
 
-            with open(os.path.join(self._dummy_dir.name, hdr), 'w'):
-                pass
+        # Touch empty files
+        for hdr in self._dummy_headers:
+            fd = os.open(os.path.join(root, hdr), os.O_CREAT | os.O_WRONLY, 0o600)
+            os.close(fd)
 
         return len(self._dummy_headers) > 0
 
@@ -106,18 +125,18 @@ class UBootHeaderChecker(ConfigChecker):
             self._dummy_dir.cleanup()
 
     def _report_errors(self, stderr, retcode):
-        msg = 'Preprocessor ({:s}) encountered errors, shown below.'
-        msg += os.linesep + self._INDENT  + 'Checker result may be incomplete.' + 2*os.linesep
-        log.error(msg.format(self._cpp) + textwrap.indent(stderr, self._INDENT))
+        msg = ('Preprocessor ({:s}) encountered errors, shown below.\n'
+               '{:s}Checker result may be incomplete.\n\n')
+        log.error(msg.format(self._cpp, self._INDENT) + textwrap.indent(stderr, self._INDENT))
 
         if '#include <asm/arch' in stderr:
-            msg = 'The above looks like an `#include <asm/arch/...>` issue?' + os.linesep
-            msg += self._INDENT + "If so, you'll need to either attempt a build or manually create" + os.linesep
-            msg += self._INDENT + "a symlink to arch/$(ARCH)/include/asm/arch-$(SOC)." + os.linesep
-            msg += os.linesep
-            msg += self._INDENT + 'Alternatively, if the file in question is not useful for configuration ' + os.linesep
-            msg += self._INDENT + 'auditing you can specify it as a "dummy header." to skip it' + os.linesep
-            log.note(msg)
+            msg = ('The above looks like an `#include <asm/arch/...>` issue?\n'
+                   "{0:s}If so, you'll need to either attempt a build or manually create\n"
+                   '{0:s}a symlink to arch/$(ARCH)/include/asm/arch-$(SOC).\n'
+                   '\n'
+                   '{0:s}Alternatively, if the file in question is not useful for configuration \n'
+                   '{0:s}auditing you can specify it as a "dummy header." to skip it\n')
+            log.note(msg.format(self._INDENT))
 
         if retcode != 0:
             raise ValueError('Preprocessor returned status {:d}'.format(retcode))
@@ -126,26 +145,39 @@ class UBootHeaderChecker(ConfigChecker):
         log.note('Running preprocessor to collect macro definitions')
         log.debug('Command: ' + ' '.join(cmd))
 
-        proc = subprocess.run(cmd, capture_output=True, check=False, text=True)
-        if proc.stderr:
-            self._report_errors(proc.stderr, proc.returncode)
-
-        output = proc.stdout
-
-        pat = r'#define\s+(?P<ident>[A-Za-z0-9_]+)(?P<args>\([A-Za-z0-9_ ,\.]*\))?\s+(?P<value>.*)'
-        macro_def = re.compile(pat)
-
-        pat = r'#undef\s+(?P<ident>[A-Za-z0-9_]+)'
-        macro_undef = re.compile(pat)
-
         # TODO: Would be nice if we could collect the *actual* filename/lineno from cpp.
         # We should have some context from the cpp -dD output..
         source = filename + ' (preprocessed), '
 
-        for line in output.splitlines():
-            match = macro_def.match(line)
-            if match:
-                ident = match.group('ident')
+        # Parse the preprocessor output as it is produced, rather than holding
+        # the entire (potentially very large) output in memory.
+        #
+        # Entries are collected and only added to our configuration once we know
+        # that the preprocessor did not fail. stderr is spooled to a temporary file
+        # so that the child can never block on a full pipe while we read stdout.
+        entries = []
+
+        with TemporaryFile('w+') as stderr_file:
+            with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, text=True) as proc:
+                for line in proc.stdout:
+                    # The majority of lines are code, not directives. Skip them before
+                    # paying for a regex match.
+                    if not line.startswith('#'):
+                        continue
+
+                    match = _MACRO_RE.match(line.rstrip('\n'))
+                    if match:
+                        entries.append(match)
+
+            stderr_file.seek(0)
+            stderr = stderr_file.read()
+
+        if stderr:
+            self._report_errors(stderr, proc.returncode)
+
+        for match in entries:
+            ident = match.group('def_ident')
+            if ident is not None:
                 value = match.group('value')
 
                 # Treat `#define CONFIG_THE_THING` (sans value) as "the thing is enabled" --> True
@@ -155,15 +187,30 @@ class UBootHeaderChecker(ConfigChecker):
                 self._add_config_entry(ident, value, source + ident, warn=False)
                 log.debug('Collected #define > ' + ident + ' = ' + str(value))
             else:
-                match = macro_undef.match(line)
-                if match:
-                    # Treat `#undef CONFIG_THE_THING` as "disable the thing" --> False
-                    ident = match.group('ident')
-                    value = False
-                    self._add_config_entry(ident, value, source + ident, warn=False, force=True)
-                    log.debug('Collected #undef  > ' + ident + ' = ' + str(value))
+                # Treat `#undef CONFIG_THE_THING` as "disable the thing" --> False
+                ident = match.group('undef_ident')
+                value = False
+                self._add_config_entry(ident, value, source + ident, warn=False, force=True)
+                log.debug('Collected #undef  > ' + ident + ' = ' + str(value))
 
-        return deepcopy(self._config)
+        return self._config.copy()
+
+    def _config_defines(self):
+        """
+        Yield preprocessor arguments for each enabled item in our configuration.
+        """
+        for key, (value, _) in self._config.items():
+            if value is False:
+                # Skip items listed as '# CONFIG_* is not set'
+                continue
+
+            yield '-D'
+            if value is True:
+                yield key
+            elif isinstance(value, int):
+                yield '{:s}={:d}'.format(key, value)
+            else:
+                yield '{:s}="{:s}"'.format(key, str(value))
 
     def load(self, filename: str) -> dict:
         """
@@ -177,28 +224,13 @@ class UBootHeaderChecker(ConfigChecker):
         args = [self._cpp, '-dD', '-undef', '-nostdinc']
 
         try:
+            # Dummy headers take precedence over all other include paths.
+            # Their (temporary) location changes with each call.
             if self._create_dummy_headers():
-                args += ['-I', self._dummy_dir.name]
-
-            for path in self._inc:
-                args += ['-I', path]
-
-            # We'll miss definitions in U-Boot sources originating from the Linux
-            # kernel without these.
-            args += ['-D__KERNEL__', '-D__UBOOT__']
-
-            for key, (value, _) in self._config.items():
-                if value is False:
-                    # Skip items listed as '# CONFIG_* is not set'
-                    continue
-
-                if value is True:
-                    args += ['-D', key]
-                elif isinstance(value, int):
-                    args += ['-D', key + '=' + str(value)]
-                else:
-                    args += ['-D', key + '=' + '"' + str(value) + '"']
+                args.extend(('-I', self._dummy_dir.name))
 
+            args.extend(self._static_args)
+            args.extend(self._config_defines())
             args.append(filename)
 
             return self._run_preprocessor(filename, args)
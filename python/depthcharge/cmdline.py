@@ -11,18 +11,27 @@ Python :py:class:`argparse.Argumentparser` as well as custom :py:class:`argparse
 
 import argparse
 import json
+import sys
 
 from depthcharge import log
-from depthcharge.context    import Depthcharge
-from depthcharge.companion  import Companion
-from depthcharge.console    import Console
-from depthcharge.monitor    import Monitor
-from depthcharge.string     import keyval_list_to_dict, length_to_int, str_to_property_keyval
+
+# Imports of the remaining Depthcharge modules are deferred to the point of use,
+# such that merely constructing an ArgumentParser (e.g. for --help) does not
+# require them to be loaded.
 
 _DEFAULT_IFACE_DEVICE = '/dev/ttyUSB0'
 _DEFAULT_IFACE_BAUDRATE = '115200'
 _DEFAULT_IFACE = _DEFAULT_IFACE_DEVICE + ':' + _DEFAULT_IFACE_BAUDRATE
 
+# Python 3.10+ already titles the optional arguments group "options".
+# Only older versions require ArgumentParser.__init__() to rename it.
+_RENAME_OPTIONALS = sys.version_info < (3, 10)
+
+# Command-line arguments passed through to the Depthcharge constructor by
+# create_depthcharge_ctx(), when specified.
+_FORWARD_KEYS = ('arch', 'allow_deploy', 'skip_deploy', 'allow_reboot')
+
+
 def create_depthcharge_ctx(args, **kwargs):
     """
     Create and return an initialized :py:class:`~depthcharge.Depthcharge` handle based upon
@@ -48,6 +57,16 @@ def create_depthcharge_ctx(args, **kwargs):
     * *allow_reboot* - From :py:meth:`ArgumentParser.add_allow_reboot_argument()`
 
     """
+    # pylint: disable=import-outside-toplevel
+    from depthcharge.context    import Depthcharge
+    from depthcharge.companion  import Companion
+    from depthcharge.console    import Console
+    from depthcharge.monitor    import Monitor
+
+    # Single dict from which we can retrieve optional items, without the need
+    # for separate hasattr() and getattr() calls for each
+    args_dict = vars(args)
+
     monitor = Monitor.create(args.monitor)
 
     # Added as a quick way to sneak in a timeout=... value to increase down
@@ -60,54 +79,107 @@ def create_depthcharge_ctx(args, **kwargs):
     # less annoying when working with a device that uses the non-default
     # baud rate and forgetting to provide -i <iface>, thereby relying on the
     # /dev/ttyUSB0 default.
-    if args.iface == _DEFAULT_IFACE and hasattr(args, 'config') and args.config:
+    config_file = args_dict.get('config')
+    config = None
+    if config_file:
         try:
-            with open(args.config) as infile:
-                config = json.loads(infile.read())
-                args.iface = _DEFAULT_IFACE_DEVICE + ':' + str(config['baudrate'])
-        except (KeyError, FileNotFoundError):
-            # No worries! Keep calm and carry on hacking.
+            with open(config_file) as infile:
+                config = json.load(infile)
+        except FileNotFoundError:
+            # No worries! We'll create it when we call save().
             pass
 
-    console = Console(args.iface,
+    # The -i, --iface default is None, such that an explicitly provided value is
+    # honored even if it matches the default.
+    iface = args.iface
+    if iface is None:
+        if config is not None and 'baudrate' in config:
+            iface = _DEFAULT_IFACE_DEVICE + ':' + str(config['baudrate'])
+        else:
+            iface = _DEFAULT_IFACE
+
+    console = Console(iface,
                       prompt=args.prompt,
                       monitor=monitor,
                       **console_kwargs)
 
-    if hasattr(args, 'companion') and args.companion:
-        device, companion_kwargs = args.companion
+    companion_arg = args_dict.get('companion')
+    if companion_arg:
+        device, companion_kwargs = companion_arg
         companion = Companion(device, **companion_kwargs)
     else:
         companion = None
 
     # Join any "extra" arguments destined for depthcharge.Operation **kwargs
-    # to out existing kwargs.
+    # to out existing kwargs. (This function's own **kwargs dict is not shared
+    # with the caller, so it's safe to update in place.)
     if args.extra:
-        kwargs = {**kwargs, **args.extra}
+        kwargs.update(args.extra)
 
     # Arguments to pass to Depthcharge if non-None or True (for bools)
-    keys = ('arch', 'allow_deploy', 'skip_deploy', 'allow_reboot')
-
-    for key in keys:
-        if hasattr(args, key) and getattr(args, key):
-            kwargs[key] = getattr(args, key)
-
-    if hasattr(args, 'config') and args.config:
-        try:
-            log.info('Loading existing config: ' + args.config)
-            return Depthcharge.load(args.config,
-                                    console,
-                                    companion=companion,
-                                    **kwargs)
-        except FileNotFoundError:
-            # We'll create it when we call save()
-            pass
+    for key in _FORWARD_KEYS:
+        value = args_dict.get(key)
+        if value:
+            kwargs[key] = value
+
+    if config is not None:
+        log.info('Loading existing config: ' + config_file)
+        # Equivalent to Depthcharge.load(), but reuses the already-parsed config
+        return Depthcharge.from_dict(config,
+                                     console,
+                                     companion=companion,
+                                     **kwargs)
 
     return Depthcharge(console,
                        companion=companion,
                        **kwargs)
 
 
+def _apply_defaults(kwargs: dict, **defaults) -> dict:
+    """
+    Return a dictionary of keyword arguments for an ``add_argument()`` call,
+    in which items in *kwargs* supplied by the caller take precedence over
+    the provided *defaults*.
+    """
+    return {**defaults, **kwargs}
+
+
+def _to_address(arg: str) -> int:
+    """
+    ArgumentParser ``type=`` converter for memory and device addresses.
+    See :py:class:`AddressAction` for supported suffixes.
+    """
+    from depthcharge.string import length_to_int  # pylint: disable=import-outside-toplevel
+    try:
+        return length_to_int(arg, desc='address')
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+
+
+def _to_length(arg: str) -> int:
+    """
+    ArgumentParser ``type=`` converter for length values.
+    See :py:class:`AddressAction` for supported suffixes.
+    """
+    from depthcharge.string import length_to_int  # pylint: disable=import-outside-toplevel
+    try:
+        return length_to_int(arg)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+
+
+def _to_companion(arg: str) -> tuple:
+    """
+    ArgumentParser ``type=`` converter for Companion arguments.
+    See :py:class:`CompanionAction` for the resulting value.
+    """
+    from depthcharge.string import str_to_property_keyval  # pylint: disable=import-outside-toplevel
+    try:
+        return str_to_property_keyval(arg)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+
+
 class AddressAction(argparse.Action):
     """
     ArgumentParser Action for validating memory and device addresses.
@@ -121,8 +193,12 @@ class AddressAction(argparse.Action):
         * GB = 1000 * 1000 * 1000
         * G or GiB = 1024 * 1024 * 1024
 
+    :py:class:`ArgumentParser` no longer uses this action itself, in favor of a
+    lighter-weight ``type=`` conversion. It remains available for API users.
+
     """
     def __call__(self, parser, namespace, address, option_string=None):
+        from depthcharge.string import length_to_int  # pylint: disable=import-outside-toplevel
         value = length_to_int(address, desc='address')
         setattr(namespace, self.dest, value)
 
@@ -135,8 +211,12 @@ class CompanionAction(argparse.Action):
 
     ``(device, params={key: value})``
 
+    :py:class:`ArgumentParser` no longer uses this action itself, in favor of a
+    lighter-weight ``type=`` conversion. It remains available for API users.
+
     """
     def __call__(self, parser, namespace, companion_str, option_string=None):
+        from depthcharge.string import str_to_property_keyval  # pylint: disable=import-outside-toplevel
         setattr(namespace, self.dest, str_to_property_keyval(companion_str))
 
 
@@ -145,17 +225,22 @@ class ListAction(argparse.Action):
     ArgumentParser action for creating lists from comma-separated strings.
 
     For example, ``--op foo,bar,baz``  ``--op fizz,buzz`` would result in the list
-    `[foo, bar, baz, fizz, buzz]`.
+    `[foo, bar, baz, fizz, buzz]`. Empty entries (e.g. ``--op foo,,bar,``) are ignored.
 
     """
     def __call__(self, parser, namespace, arg, option_string=None):
-        fields = arg.split(',')
-        for i, entry in enumerate(fields):
-            fields[i] = entry.strip()
+        fields = [entry for entry in (field.strip() for field in arg.split(',')) if entry]
+        if not fields:
+            return
 
-        if fields:
-            curr_list = getattr(namespace, self.dest) or []
-            setattr(namespace, self.dest, curr_list + fields)
+        # Copy the default value (if any) on first use, and then extend our
+        # own list in place for subsequent occurrences of the argument.
+        curr_list = getattr(namespace, self.dest, None)
+        if curr_list is None or curr_list is self.default:
+            curr_list = list(self.default) if self.default else []
+            setattr(namespace, self.dest, curr_list)
+
+        curr_list.extend(fields)
 
 
 class KeyValListAction(argparse.Action):
@@ -170,22 +255,35 @@ class KeyValListAction(argparse.Action):
 
     """
     def __call__(self, parser, namespace, info_str, option_string=None):
-        info_list = info_str.split(',')
-        info_dict = keyval_list_to_dict(info_list)
+        if ',' not in info_str and '=' not in info_str:
+            # Common case of a lone boolean setting (e.g. -X fortytwo)
+            info_dict = {info_str.strip(): True}
+        else:
+            from depthcharge.string import keyval_list_to_dict  # pylint: disable=import-outside-toplevel
+            # keyval_list_to_dict() splits each list entry on commas itself,
+            # so there's no need for us to split info_str beforehand.
+            info_dict = keyval_list_to_dict((info_str,))
 
-        # Namespace overrides something such that getatter with a default
-        # parameter still returns None and doesn't raise AttributeError?
-        keyval_dict = getattr(namespace, self.dest) or {}
+        # As with ListAction, copy the default value (if any) on first use
+        # and then update our own dictionary in place thereafter.
+        keyval_dict = getattr(namespace, self.dest, None)
+        if keyval_dict is None or keyval_dict is self.default:
+            keyval_dict = dict(self.default) if self.default else {}
+            setattr(namespace, self.dest, keyval_dict)
 
-        setattr(namespace, self.dest, {**keyval_dict, **info_dict})
+        keyval_dict.update(info_dict)
 
 
 class LengthAction(argparse.Action):
     """
     ArgumentParser action for parsing length values with support for the
     same suffixes supported by :py:class:`AddressAction`.
+
+    :py:class:`ArgumentParser` no longer uses this action itself, in favor of a
+    lighter-weight ``type=`` conversion. It remains available for API users.
     """
     def __call__(self, parser, namespace, length, option_string=None):
+        from depthcharge.string import length_to_int  # pylint: disable=import-outside-toplevel
         value = length_to_int(length)
         setattr(namespace, self.dest, value)
 
@@ -223,6 +321,26 @@ class ArgumentParser(argparse.ArgumentParser):
         'allow_reboot',
     ]
 
+    # Used for membership tests on DEFAULT_ARGS
+    _DEFAULT_ARGS_SET = frozenset(DEFAULT_ARGS)
+
+    # Maps each <x> to its add_<x>_argument() function. This is populated
+    # for each class (and subclass) by _build_add_fn_table().
+    _ADD_FUNCS = {}
+
+    # Arguments that may be omitted from the parser when ``sniff=True`` and
+    # they do not appear on the command line. Each entry maps an *init_args*
+    # name to its (dest, option strings, default value).
+    _SNIFFABLE_ARGS = {
+        'arch':         ('arch',         ('--arch',),                 None),
+        'config':       ('config',       ('-c', '--config'),          None),
+        'companion':    ('companion',    ('-C', '--companion'),       None),
+        'monitor':      ('monitor',      ('-m', '--monitor'),         None),
+        'allow_deploy': ('allow_deploy', ('-A', '--allow-deploy'),    False),
+        'skip_deploy':  ('skip_deploy',  ('-S', '--skip-deploy'),     False),
+        'allow_reboot': ('allow_reboot', ('-R', '--allow-reboot'),    False),
+    }
+
     def _perform_arg_handler_init(self, init_args: list, kwargs_dict: dict):
         """
         Helper for __init__() to aggregate the requested add_<x>_argument()
@@ -234,28 +352,60 @@ class ArgumentParser(argparse.ArgumentParser):
         """
 
         # Pull out kwargs that are intended for our add_<x>_argument() calls
-        # and assign them to their corresponding init calls.
+        # and assign them to their corresponding init calls, in a single pass.
+        #
+        # Because <x> may itself contain underscores (e.g. allow_deploy), the
+        # longest matching <x> prefix is used.
+        fn_kwargs = {name: {} for name in init_args}
+
+        # Leading tokens of each <x>, used to quickly pass over keyword arguments
+        # intended for the superclass (e.g. description, epilog).
+        heads = {name.partition('_')[0] for name in init_args}
+
+        for key in list(kwargs_dict):
+            if key.partition('_')[0] not in heads:
+                continue
+
+            idx = key.rfind('_')
+            while idx > 0:
+                name = key[:idx]
+                if name in fn_kwargs:
+                    # Remove items from kwargs so that the super class doesn't raise
+                    # a TypeError over unexpected keyword arguments
+                    fn_kwargs[name][key[idx + 1:]] = kwargs_dict.pop(key)
+                    break
+                idx = key.rfind('_', 0, idx)
+
         init_operations = []
         for name in init_args:
-            to_pop = []
-            fn_kwargs = {}
-            for key in kwargs_dict:
-                if key.startswith(name + '_'):
-                    to_pop.append(key)
-                    fn_keyword = key.replace(name + '_', '')
-                    fn_kwargs[fn_keyword] = kwargs_dict[key]
+            init_fn = self._ADD_FUNCS.get(name)
+            if init_fn is not None:
+                init_fn = init_fn.__get__(self)
+            else:
+                # Not in the table, such as a method attached after class creation.
+                # This raises an AttributeError if no such method exists.
+                init_fn = getattr(self, 'add_' + name + '_argument')
 
-            # Remove items from kwargs so that the super class doesn't raise
-            # a TypeError over unexpected keyword arguments
-            for key in to_pop:
-                kwargs_dict.pop(key)
+            init_operations.append((name, init_fn, fn_kwargs[name]))
+
+        return init_operations
 
-            fn_name = 'add_' + name + '_argument'
-            init_fn = getattr(self, fn_name)
+    @classmethod
+    def _build_add_fn_table(cls):
+        """
+        Populate the class's ``_ADD_FUNCS`` dispatch table from its add_<x>_argument() methods,
+        such that they need not be looked up by name for each ArgumentParser instance.
+        """
+        cls._ADD_FUNCS = {
+            attr[4:-9]: getattr(cls, attr) for attr in dir(cls)
+            if attr.startswith('add_') and attr.endswith('_argument') and len(attr) > 13
+        }
 
-            init_operations.append((init_fn, fn_kwargs))
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
 
-        return init_operations
+        # Pick up any overridden or additional add_<x>_argument() methods
+        cls._build_add_fn_table()
 
     def __init__(self, init_args='default', **kwargs):
         """
@@ -264,7 +414,7 @@ class ArgumentParser(argparse.ArgumentParser):
 
         The `init_args` parameter can be used to specify which of this class's
         `add_<x>_argument()` methods should be invoked. This can be specified
-        as a list of names, each of which corresponds to the `<x>` in the
+        as a list (or tuple) of names, each of which corresponds to the `<x>` in the
         Depthcharge-specific `add_<x>_argument()` methods.
 
         For example, if one wishes to configure only the *iface* and *monitor*
@@ -285,6 +435,14 @@ class ArgumentParser(argparse.ArgumentParser):
         the *baudrate* option, specify `baudrate_required=True`. This will
         result in `add_baudrate_argument()` being called with `required=True`.
 
+        If `sniff=True` is specified, the command line is inspected when it is
+        first parsed, and optional Depthcharge arguments that do not appear in it
+        are not registered at that time. Their default values are still present in the
+        parsed Namespace. All arguments are registered when help is requested,
+        before usage or error messages are produced, and prior to any subsequent parse.
+        This has no effect when `fromfile_prefix_chars` or non-default `prefix_chars`
+        are used.
+
         Any other `kwargs` items are passed directly to the underlying
         argparse.ArgumentParser. Items specific to Depthcharge will be removed
         from `kwargs` before being passed to Python's underlying
@@ -293,24 +451,32 @@ class ArgumentParser(argparse.ArgumentParser):
         If any values in `init_args` are invalid, a :py:class:`AttributeError` is rai
         :Raises: :py:class:`AttributeError` if a name in `init_args` is invalid.
         """
-        if init_args == 'default':
-            init_args = self.DEFAULT_ARGS
-        elif init_args in self.DEFAULT_ARGS:
-            init_args = [init_args]
+        if isinstance(init_args, str):
+            if init_args == 'default':
+                init_args = self.DEFAULT_ARGS
+            elif init_args in self._DEFAULT_ARGS_SET:
+                init_args = (init_args,)
+            else:
+                raise TypeError('init_args expected to be a string or list')
         elif init_args is None:
-            init_args = []
-        elif not isinstance(init_args, list):
+            init_args = ()
+        elif not isinstance(init_args, (list, tuple)):
             raise TypeError('init_args expected to be a string or list')
 
         # Passing kwargs as dict in order to allow items to be pop()'d
         # before they're passed to the superclass
         init_operations = self._perform_arg_handler_init(init_args, kwargs)
+        sniff = kwargs.pop('sniff', False)
 
         super().__init__(**kwargs)
-        for op in init_operations:
-            op_fn = op[0]
-            op_kwargs = op[1]
-            op_fn(**op_kwargs)
+
+        # Arguments read from files (fromfile_prefix_chars) and alternative option
+        # prefixes can't be reliably identified by _argv_uses_option().
+        self._sniff = sniff and not self.fromfile_prefix_chars and self.prefix_chars == '-'
+
+        # Defer registration of these arguments until they're actually needed.
+        # (See _flush_pending_init() and its callers.)
+        self._pending_init_ops = init_operations
 
         # I don't subscribe to the "option flags are for optional arguments,
         # use positionals if they're required".  The flags help me remember
@@ -318,39 +484,153 @@ class ArgumentParser(argparse.ArgumentParser):
         #
         # I want to use required=True, even though the Python docs discourage it,
         # and don't want these to be reported as "optional arguments".
-        try:
+        if _RENAME_OPTIONALS:
             self._optionals.title = 'options'
-        except AttributeError:
-            pass
+
+    _pending_init_ops = None
+    _sniff = False
+
+    @staticmethod
+    def _argv_uses_option(argv, option_strings) -> bool:
+        """
+        Conservatively determine whether any of the *option_strings* may be used in *argv*.
+        False positives are acceptable; false negatives are not.
+        """
+        for token in argv:
+            if token == '--':
+                break
+
+            if token.startswith('--'):
+                # Account for --opt=value and abbreviated long options
+                token = token.split('=', 1)[0]
+                for opt in option_strings:
+                    if opt.startswith('--') and opt.startswith(token):
+                        return True
+            elif token.startswith('-'):
+                # Account for clustered short options (e.g. -AS) and -Xvalue
+                for opt in option_strings:
+                    if not opt.startswith('--') and opt[1] in token[1:]:
+                        return True
+
+        return False
+
+    def _flush_pending_init(self, argv=None):
+        """
+        Register any arguments requested via *init_args* that have not yet been added.
+
+        This is performed prior to any operation that inspects or adds to the
+        parser's arguments, such that the resulting parser is indistinguishable
+        from one whose arguments were registered in the constructor.
+
+        When invoked with the command line about to be parsed (*argv*) and the
+        parser was created with ``sniff=True``, optional arguments absent from
+        *argv* are skipped, with only their default values being set. This is
+        done only for the first parse; skipped arguments remain pending and are
+        registered by any subsequent call, including those that produce usage
+        and error messages.
+        """
+        pending = self._pending_init_ops
+        if not pending:
+            return
+
+        self._pending_init_ops = None
+
+        sniff = (self._sniff and argv is not None and
+                 not self._argv_uses_option(argv, ('-h', '--help')))
+
+        skipped = []
+        for op in pending:
+            name, op_fn, op_kwargs = op
+            entry = self._SNIFFABLE_ARGS.get(name) if sniff else None
+            if entry is not None and not op_kwargs.get('required', False):
+                dest, option_strings, default = entry
+                if not self._argv_uses_option(argv, option_strings):
+                    self.set_defaults(**{dest: op_kwargs.get('default', default)})
+                    skipped.append(op)
+                    continue
+
+            op_fn(**op_kwargs)
+
+        if sniff:
+            self._sniff = False
+            self._pending_init_ops = skipped or None
+
+    # pylint: disable=missing-function-docstring
+
+    def add_argument(self, *args, **kwargs):  # pylint: disable=signature-differs
+        self._flush_pending_init()
+        return super().add_argument(*args, **kwargs)
+
+    def add_argument_group(self, *args, **kwargs):
+        self._flush_pending_init()
+        return super().add_argument_group(*args, **kwargs)
+
+    def add_mutually_exclusive_group(self, **kwargs):
+        self._flush_pending_init()
+        return super().add_mutually_exclusive_group(**kwargs)
+
+    def add_subparsers(self, **kwargs):
+        self._flush_pending_init()
+        return super().add_subparsers(**kwargs)
+
+    def set_defaults(self, **kwargs):
+        self._flush_pending_init()
+        return super().set_defaults(**kwargs)
+
+    def get_default(self, dest):
+        self._flush_pending_init()
+        return super().get_default(dest)
+
+    def parse_known_args(self, args=None, namespace=None):
+        self._flush_pending_init(sys.argv[1:] if args is None else list(args))
+        return super().parse_known_args(args, namespace)
+
+    def parse_known_intermixed_args(self, args=None, namespace=None):
+        self._flush_pending_init(sys.argv[1:] if args is None else list(args))
+        return super().parse_known_intermixed_args(args, namespace)
+
+    def format_usage(self):
+        self._flush_pending_init()
+        return super().format_usage()
+
+    def error(self, message):
+        self._flush_pending_init()
+        super().error(message)
+
+    def format_help(self):
+        self._flush_pending_init()
+        return super().format_help()
+
+    # pylint: enable=missing-function-docstring
 
     def add_address_argument(self, **kwargs):
         """
         Add a memory address argument to the ArgumentParser.
         """
         default_value = kwargs.pop('default', 0)
-        help_text = 'Base address of image.'
         is_required = kwargs.pop('required', default_value is not None)
 
-        if default_value is not None:
-            help_text += ' Default: 0x{:08x}'.format(default_value)
+        # Only build default help text if the caller didn't provide their own.
+        if 'help' not in kwargs:
+            help_text = 'Base address of image.'
+            if default_value is not None:
+                # Left for argparse to expand if and when help text is rendered
+                help_text += ' Default: %(default)#010x'
+            kwargs['help'] = help_text
 
+        params = _apply_defaults(kwargs, metavar='<value>')
         self.add_argument('-a', '--address',
-                          metavar=kwargs.pop('metavar', '<value>'),
-                          default=kwargs.pop('default', default_value),
-                          action=AddressAction,
+                          default=default_value,
+                          type=_to_address,
                           required=is_required,
-                          help=kwargs.pop('help', help_text),
-                          **kwargs)
+                          **params)
 
     def add_arch_argument(self, **kwargs):
         """
         Add a CPU architecture argument to the ArgumentParser.
         """
-        help_text = kwargs.pop('help', 'CPU architecture.')
-        self.add_argument('--arch',
-                          metavar=kwargs.pop('metavar', '<architecture>'),
-                          help=kwargs.pop('help', help_text),
-                          **kwargs)
+        params = _apply_defaults(kwargs, metavar='<architecture>', help='CPU architecture.')
+        self.add_argument('--arch', **params)
 
     def add_companion_argument(self, **kwargs):
         """
@@ -363,12 +643,12 @@ class ArgumentParser(argparse.ArgumentParser):
             'See the depthcharge.Companion documentation for supported settings.'
         )
 
-        self.add_argument('-C', '--companion',
-                          metavar=kwargs.pop('metavar', '<device>[:setting=value,...]'),
-                          default=kwargs.pop('default', None),
-                          action=CompanionAction,
-                          help=kwargs.pop('help', help_text),
-                          **kwargs)
+        params = _apply_defaults(kwargs,
+                                 metavar='<device>[:setting=value,...]',
+                                 default=None,
+                                 help=help_text)
+
+        self.add_argument('-C', '--companion', type=_to_companion, **params)
 
     def add_config_argument(self, **kwargs):
         """
@@ -379,10 +659,8 @@ class ArgumentParser(argparse.ArgumentParser):
             'It will be created if it does not exist.'
         )
 
-        self.add_argument('-c', '--config',
-                          metavar=kwargs.pop('metavar', '<cfg>'),
-                          help=kwargs.pop('help', help_text),
-                          **kwargs)
+        params = _apply_defaults(kwargs, metavar='<cfg>', help=help_text)
+        self.add_argument('-c', '--config', **params)
 
     def add_data_argument(self, **kwargs):
         """
@@ -391,9 +669,8 @@ class ArgumentParser(argparse.ArgumentParser):
         The caller is required to provide help text in order to describe the
         nature of the data users must provide.
         """
-        self.add_argument('-d', '--data',
-                          metavar=kwargs.pop('metavar', '<hex str>'),
-                          **kwargs)
+        params = _apply_defaults(kwargs, metavar='<hex str>')
+        self.add_argument('-d', '--data', **params)
 
     def add_extra_argument(self, **kwargs):
         """
@@ -409,12 +686,8 @@ class ArgumentParser(argparse.ArgumentParser):
             'depthcharge.Operation for supported keyword arguments.'
         )
 
-        self.add_argument('-X', '--extra',
-                          metavar=kwargs.pop('metavar', '<key>[=<value>]'),
-                          action=KeyValListAction,
-                          default=kwargs.pop('default', {}),
-                          help=kwargs.pop('help', help_text),
-                          **kwargs)
+        params = _apply_defaults(kwargs, metavar='<key>[=<value>]', default={}, help=help_text)
+        self.add_argument('-X', '--extra', action=KeyValListAction, **params)
 
     def add_file_argument(self, **kwargs):
         """
@@ -423,23 +696,25 @@ class ArgumentParser(argparse.ArgumentParser):
         The caller **must** provide the help text in order to specify the
         purpose of this file, and whether it is an input or output file.
         """
-        if help is None:
+        if 'help' not in kwargs:
             raise ValueError('Help text must be provided for -f,--file ')
 
-        self.add_argument('-f', '--file',
-                          metavar=kwargs.pop('metavar', '<path>'),
-                          **kwargs)
+        params = _apply_defaults(kwargs, metavar='<path>')
+        self.add_argument('-f', '--file', **params)
 
     def add_interface_argument(self, **kwargs):
         """
         Add a serial console interface option the the ArgumentParser.
         """
         help_text = 'Serial port interface connected to U-Boot console.'
-        self.add_argument('-i', '--iface',
-                          metavar=kwargs.pop('metavar', '<console dev>[:baudrate]'),
-                          default=kwargs.pop('default', _DEFAULT_IFACE),
-                          help=kwargs.pop('help', help_text),
-                          **kwargs)
+
+        # When left as None, create_depthcharge_ctx() uses a default interface.
+        params = _apply_defaults(kwargs,
+                                 metavar='<console dev>[:baudrate]',
+                                 default=None,
+                                 help=help_text)
+
+        self.add_argument('-i', '--iface', **params)
 
     def add_op_argument(self, **kwargs):
         """
@@ -452,12 +727,8 @@ class ArgumentParser(argparse.ArgumentParser):
             'the best available option if this is not provided.'
         )
 
-        self.add_argument('--op',
-                          metavar=kwargs.pop('metavar', '<name>[,name,...]'),
-                          default=kwargs.pop('default', None),
-                          action=ListAction,
-                          help=kwargs.pop('help', help_text),
-                          **kwargs)
+        params = _apply_defaults(kwargs, metavar='<name>[,name,...]', default=None, help=help_text)
+        self.add_argument('--op', action=ListAction, **params)
 
     def add_length_argument(self, **kwargs):
         """
@@ -468,13 +739,12 @@ class ArgumentParser(argparse.ArgumentParser):
         default_value = kwargs.pop('default', None)
         is_required = kwargs.pop('required', default_value is None)
 
+        params = _apply_defaults(kwargs, metavar='<n>', help='Number of bytes to read')
         self.add_argument('-l', '--length',
                           default=default_value,
                           required=is_required,
-                          metavar=kwargs.pop('metavar', '<n>'),
-                          action=LengthAction,
-                          help=kwargs.pop('help', 'Number of bytes to read'),
-                          **kwargs)
+                          type=_to_length,
+                          **params)
 
     def add_monitor_argument(self, **kwargs):
         """
@@ -484,11 +754,8 @@ class ArgumentParser(argparse.ArgumentParser):
             'Attach a console monitor. Valid types: file, pipe, colorpipe, term'
         )
 
-        self.add_argument('-m', '--monitor',
-                          metavar='<type>[:options,...]',
-                          default=kwargs.pop('default', None),
-                          help=kwargs.pop('help', help_text),
-                          **kwargs)
+        params = _apply_defaults(kwargs, metavar='<type>[:options,...]', default=None, help=help_text)
+        self.add_argument('-m', '--monitor', **params)
 
     def add_allow_reboot_argument(self, **kwargs):
         """
@@ -498,11 +765,8 @@ class ArgumentParser(argparse.ArgumentParser):
         default_help = ('Allow operations that require crashing or '
                         'rebooting the target to be performed.')
 
-        self.add_argument('-R', '--allow-reboot',
-                          default=kwargs.pop('default', False),
-                          action='store_true',
-                          help=kwargs.pop('help', default_help),
-                          **kwargs)
+        params = _apply_defaults(kwargs, action='store_true', default=False, help=default_help)
+        self.add_argument('-R', '--allow-reboot', **params)
 
     def add_outfile_argument(self, **kwargs):
         """
@@ -519,9 +783,8 @@ class ArgumentParser(argparse.ArgumentParser):
         if 'help' not in kwargs:
             raise ValueError('Help text must be provided for -o,--outfile ')
 
-        self.add_argument('-o', '--outfile',
-                          metavar=kwargs.pop('meta', '<path>'),
-                          **kwargs)
+        params = _apply_defaults(kwargs, metavar='<path>')
+        self.add_argument('-o', '--outfile', **params)
 
     def add_prompt_argument(self, **kwargs):
         """
@@ -529,11 +792,8 @@ class ArgumentParser(argparse.ArgumentParser):
         prompt to be supplied via the command line.
         """
         help_text = 'Override expected U-Boot prompt string.'
-        self.add_argument('-P', '--prompt',
-                          metavar='<prompt str>',
-                          default=kwargs.pop('default', None),
-                          help=kwargs.pop('help', help_text),
-                          **kwargs)
+        params = _apply_defaults(kwargs, metavar='<prompt str>', default=None, help=help_text)
+        self.add_argument('-P', '--prompt', **params)
 
     def add_allow_deploy_argument(self, **kwargs):
         """
@@ -543,11 +803,8 @@ class ArgumentParser(argparse.ArgumentParser):
         help_text = ('Allow payloads to be deployed and executed. '
                      'Functionality may be limited if this is not specified.')
 
-        self.add_argument('-A', '--allow-deploy',
-                          action='store_true',
-                          default=kwargs.pop('default', False),
-                          help=kwargs.pop('help', help_text),
-                          **kwargs)
+        params = _apply_defaults(kwargs, action='store_true', default=False, help=help_text)
+        self.add_argument('-A', '--allow-deploy', **params)
 
     def add_skip_deploy_argument(self, **kwargs):
         """
@@ -559,11 +816,8 @@ class ArgumentParser(argparse.ArgumentParser):
                      "assume payloads are already deployed and execute as-needed. "
                      'This has no effect when -A, --allow-deploy is used.')
 
-        self.add_argument('-S', '--skip-deploy',
-                          action='store_true',
-                          default=kwargs.pop('default', False),
-                          help=kwargs.pop('help', help_text),
-                          **kwargs)
+        params = _apply_defaults(kwargs, action='store_true', default=False, help=help_text)
+        self.add_argument('-S', '--skip-deploy', **params)
 
     def add_stratagem_argument(self, **kwargs):
         """
@@ -576,6 +830,8 @@ class ArgumentParser(argparse.ArgumentParser):
         if 'help' not in kwargs:
             raise ValueError('Help text must be provided for -s,--stratagem')
 
-        self.add_argument('-s', '--stratagem',
-                          metavar=kwargs.pop('metavar', '<file>'),
-                          **kwargs)
+        params = _apply_defaults(kwargs, metavar='<file>')
+        self.add_argument('-s', '--stratagem', **params)
+
+
+ArgumentParser._build_add_fn_table()  # pylint: disable=protected-access
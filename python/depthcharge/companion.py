@@ -4,7 +4,10 @@
 Support for devices running the Depthcharge "Companion" firmware
 """
 
+import json
 import os
+import struct
+
 import serial
 
 from . import log
@@ -42,6 +45,11 @@ class Companion:
     * *i2c_speed* - I2C bus speed, in Hz. May be set later via :py:meth:`set_i2c_speed()`.
       Default: *i2c_speed=100000*
 
+    Opening a Companion device requires its firmware version and capabilities to be queried.
+    If the *DEPTHCHARGE_COMPANION_CACHE* environment variable is set to a file path,
+    the capabilities last reported by each device will be stored in this (JSON) file.
+    When a device reports the same firmware version on a later connection, its cached
+    capabilities are used rather than being queried again.
     """
 
     _cmd = {
@@ -60,8 +68,18 @@ class Companion:
         'i2c_get_write_buffer': 0x11,
     }
 
+    # Request and response header: command opcode, payload size
+    _header = struct.Struct('BB')
+    _max_payload_size = 64
+
     _status_ok = b'\00'
 
+    # Capability names and their corresponding bit masks, as reported by get_capabilities
+    _cap_bits = (
+        ('i2c_periph', 1 << 0),
+        ('spi_periph', 1 << 1),
+    )
+
     def __init__(self, device='/dev/ttyACM0', baudrate=115200, **kwargs):
         self._i2c_addr  = kwargs.pop('i2c_addr', 0x78)
         self._i2c_speed = kwargs.pop('i2c_speed', 100_000)
@@ -87,20 +105,28 @@ class Companion:
 
         self._ser = serial.Serial(port=device, baudrate=baudrate, **kwargs)
 
+        # Bound once here, rather than looked up for each command
+        self._ser_read = self._ser.read
+        self._ser_write = self._ser.write
+
         #  These two items are populated by the following calls
         self._fw_version = None
         self._fw_capabilities = None
 
         self.firmware_verison(cached=False)
-        self.firmware_capabilities(cached=False)
+
+        cache_file = os.getenv('DEPTHCHARGE_COMPANION_CACHE')
+        if not (cache_file and self._load_cached_capabilities(cache_file, device)):
+            self.firmware_capabilities(cached=False)
+            if cache_file:
+                self._store_cached_capabilities(cache_file, device)
 
         dbg_msg = 'Opened Companion @ {:s}: Firmware Version {:s}. Capabilities:'
-        dbg_msg = dbg_msg.format(device, self._fw_version)
-        for cap in self._fw_capabilities:
-            have_cap = 'Yes' if self._fw_capabilities[cap] else 'No'
-            dbg_msg += os.linesep + ' ' * 8 + cap + ': ' + have_cap
+        lines = [dbg_msg.format(device, self._fw_version)]
+        for cap, have_cap in self._fw_capabilities.items():
+            lines.append('        {:s}: {:s}'.format(cap, 'Yes' if have_cap else 'No'))
 
-        log.note(dbg_msg)
+        log.note('\n'.join(lines))
 
         if self._fw_capabilities.get('i2c_periph', False):
             self.set_i2c_addr(self._i2c_addr)
@@ -140,16 +166,70 @@ class Companion:
         if cached and self._fw_capabilities is not None:
             return self._fw_capabilities
 
-        caps = {}
         resp = self.send_cmd('get_capabilities', b'', 4)
         capraw = int.from_bytes(resp, 'little')
 
-        caps['i2c_periph'] = (capraw & (1 << 0)) != 0
-        caps['spi_periph'] = (capraw & (1 << 1)) != 0
+        caps = {name: (capraw & mask) != 0 for (name, mask) in self._cap_bits}
 
         self._fw_capabilities = caps
         return caps
 
+    @staticmethod
+    def _read_cache_file(cache_file: str) -> dict:
+        try:
+            with open(cache_file, 'r') as infile:
+                cache = json.load(infile)
+        except FileNotFoundError:
+            return {}
+
+        if not isinstance(cache, dict):
+            raise ValueError('Unexpected content in Companion cache file: ' + cache_file)
+
+        return cache
+
+    def _load_cached_capabilities(self, cache_file: str, device: str) -> bool:
+        """
+        Use capabilities cached for *device*, provided that they were recorded for the
+        firmware version it is currently running. Returns ``True`` if cached values were used.
+        """
+        try:
+            entry = self._read_cache_file(cache_file).get(device)
+        except (OSError, ValueError) as e:
+            log.debug('Failed to read Companion cache: ' + str(e))
+            return False
+
+        if not isinstance(entry, dict) or entry.get('version') != self._fw_version:
+            return False
+
+        caps = entry.get('capabilities')
+        if not isinstance(caps, dict) or set(caps) != {name for (name, _) in self._cap_bits}:
+            return False
+
+        log.debug('Using cached Companion capabilities for ' + device)
+        self._fw_capabilities = {name: bool(caps[name]) for (name, _) in self._cap_bits}
+        return True
+
+    def _store_cached_capabilities(self, cache_file: str, device: str):
+        """
+        Record the current firmware version and capabilities of *device*.
+        """
+        try:
+            cache = self._read_cache_file(cache_file)
+        except (OSError, ValueError) as e:
+            log.debug('Discarding unreadable Companion cache: ' + str(e))
+            cache = {}
+
+        cache[device] = {
+            'version': self._fw_version,
+            'capabilities': self._fw_capabilities
+        }
+
+        try:
+            with open(cache_file, 'w') as outfile:
+                json.dump(cache, outfile, indent=4)
+        except OSError as e:
+            log.debug('Failed to write Companion cache: ' + str(e))
+
     def _require_i2c_support(self):
         if not self._fw_capabilities['i2c_periph']:
             raise NotImplementedError('This firmware does not implement I2C peripheral functionality')
@@ -187,7 +267,7 @@ class Companion:
             raise ValueError('Invalid address: 0x{:02x}'.format(addr))
 
         log.note('Setting Companion I2C device address to 0x{:02x}'.format(addr))
-        self.send_cmd('i2c_set_addr', addr.to_bytes(1, 'big'), 1, self._status_ok)
+        self._send_status_cmd('i2c_set_addr', addr.to_bytes(1, 'big'))
 
         self._i2c_addr = addr
 
@@ -221,7 +301,7 @@ class Companion:
 
         log.note('Setting Companion I2C bus speed to {:d} Hz'.format(speed))
 
-        self.send_cmd('i2c_set_speed', speed.to_bytes(4, 'little'), 1, self._status_ok)
+        self._send_status_cmd('i2c_set_speed', speed.to_bytes(4, 'little'))
         self._i2c_speed = speed
 
     def i2c_write_buffer(self) -> bytes:
@@ -258,44 +338,53 @@ class Companion:
         if len(data) > 32:
             raise ValueError('I2C data buffer exceeds maximum size of 32 bytes')
 
-        self.send_cmd('i2c_set_read_buffer', data, 1, self._status_ok)
-
-    def send_cmd(self, cmd_str: str, data: bytes,
-                 expected_resp_size: int = -1, expected_resp=None) -> bytes:
-        """
-        Send a raw command to the Companion device and return its response.
-        This can be used when adding new features and custom functionality to the Companion
-        firmware.
+        self._send_status_cmd('i2c_set_read_buffer', data)
 
-        If non-default values for *expected_resp* and *expected_resp_size*, an:py:exc:`IOError`
-        will be raised if the device's resonse contents or size (respectively) do not match the
-        provided expected values.
+    # Upper bound on the number of request bytes sent to the Companion device by
+    # send_batch() before reading back responses, such that we don't overrun a
+    # small receive buffer on the device. (A single request may still exceed this.)
+    _max_batch_request_size = 64
 
-        :py:exc:`ValueError` and :py:exc:`TypeError` exceptions are raised when invalid
-        arguments are provided.
+    def _build_request(self, cmd_str: str, data: bytes) -> tuple:
+        """
+        Validate and encode a command request. Returns a tuple: ``(cmd: int, request: bytes)``
         """
         try:
             cmd = self._cmd[cmd_str.lower()]
         except KeyError:
             raise ValueError('Invalid command: ' + cmd_str)
 
-        cmd = int(cmd).to_bytes(1, 'big')
-        if len(data) > 64:
+        if len(data) > self._max_payload_size:
             raise ValueError(cmd_str + ' / Data payload is too large.')
 
-        size = len(data).to_bytes(1, 'big')
-
-        request = cmd + size + data
-        self._ser.write(request)
+        return (cmd, self._header.pack(cmd, len(data)) + data)
 
-        header = self._ser.read(2)
-
-        if header[0] != cmd[0]:
-            err = cmd_str + ' / Sent cmd=0x{:02}, got response for cmd=0x{:02}'
-            raise IOError(cmd, err.format(header[0]))
-
-        size = header[1]
-        if size > 64:
+    def _read_response(self, cmd_str: str, cmd: int, expected_resp_size, expected_resp) -> bytes:
+        """
+        Read and validate the response to a previously sent command request.
+        """
+        # The firmware includes at least one byte of payload (a status code, on error)
+        # in all responses, with the exception of variable-length responses that may be
+        # empty. Read the header along with this first byte, when we know to expect it,
+        # such that short responses are received in a single read.
+        #
+        # We can't read more than that without risking blocking on an error response
+        # that's shorter than what we expected.
+        if isinstance(expected_resp_size, range):
+            min_resp_size = expected_resp_size.start
+        else:
+            min_resp_size = expected_resp_size
+
+        resp = self._ser_read(2 + min(max(min_resp_size, 0), 1))
+        if len(resp) < 2:
+            raise IOError(cmd_str + ' / Did not receive a response header from device')
+
+        resp_cmd, size = self._header.unpack_from(resp)
+        if resp_cmd != cmd:
+            err = cmd_str + ' / Sent cmd=0x{:02x}, got response for cmd=0x{:02x}'
+            raise IOError(err.format(cmd, resp_cmd))
+
+        if size > self._max_payload_size:
             err = cmd_str + ' / Received bogus payload size from device: 0x{:02x}'
             raise IOError(err.format(size))
 
@@ -308,10 +397,13 @@ class Companion:
                 err = cmd_str + ' / Expected {:d} to {:d} byte response, got {:d}-byte payload.'
                 raise IOError(err.format(expected_resp_size.start, expected_resp_size.stop - 1, size))
 
-        data = self._ser.read(size)
+        data = resp[2:]
+        if size > len(data):
+            data += self._ser_read(size - len(data))
+
         if len(data) != size:
             err = cmd_str + ' / Requested {:d} bytes, got {:d}'
-            raise IOError(err.format(len(data), size))
+            raise IOError(err.format(size, len(data)))
 
         if expected_resp is not None and expected_resp != data:
             err = cmd_str + ' / Expected response = {:s}, got {:s}'
@@ -319,6 +411,98 @@ class Companion:
 
         return data
 
+    def _send_status_cmd(self, cmd_str: str, data: bytes):
+        """
+        Send a command whose response consists solely of a 1-byte status,
+        and raise an :py:exc:`IOError` if it does not indicate success.
+
+        This is equivalent to ``send_cmd(cmd_str, data, 1, self._status_ok)``,
+        but reads and checks the fixed-size response in one step.
+        """
+        cmd, request = self._build_request(cmd_str, data)
+        self._ser_write(request)
+
+        resp = self._ser_read(3)
+        if len(resp) < 2:
+            raise IOError(cmd_str + ' / Did not receive a response header from device')
+
+        resp_cmd, size = self._header.unpack_from(resp)
+        if resp_cmd != cmd:
+            err = cmd_str + ' / Sent cmd=0x{:02x}, got response for cmd=0x{:02x}'
+            raise IOError(err.format(cmd, resp_cmd))
+
+        if size != 1:
+            err = cmd_str + ' / Expected 1-byte response, got {:d}-byte payload.'
+            raise IOError(err.format(size))
+
+        status = resp[2:]
+        if status != self._status_ok:
+            err = cmd_str + ' / Expected response = {:s}, got {:s}'
+            raise IOError(err.format(self._status_ok.hex(), status.hex()))
+
+    def send_cmd(self, cmd_str: str, data: bytes,
+                 expected_resp_size: int = -1, expected_resp=None) -> bytes:
+        """
+        Send a raw command to the Companion device and return its response.
+        This can be used when adding new features and custom functionality to the Companion
+        firmware.
+
+        If non-default values for *expected_resp* and *expected_resp_size*, an:py:exc:`IOError`
+        will be raised if the device's resonse contents or size (respectively) do not match the
+        provided expected values.
+
+        :py:exc:`ValueError` and :py:exc:`TypeError` exceptions are raised when invalid
+        arguments are provided.
+        """
+        cmd, request = self._build_request(cmd_str, data)
+        self._ser_write(request)
+        return self._read_response(cmd_str, cmd, expected_resp_size, expected_resp)
+
+    def send_batch(self, items) -> list:
+        """
+        Send multiple raw commands to the Companion device and return a list containing
+        their responses, in the same order.
+
+        Each entry in *items* is a tuple containing the :py:meth:`send_cmd()` arguments:
+        ``(cmd_str, data[, expected_resp_size[, expected_resp]])``
+
+        Rather than waiting for each response before sending the next command, requests
+        are written to the device in groups, and their responses are then read back.
+        This avoids paying a full host-device round trip for each command.
+
+        All requests are validated before any are sent. Errors are reported in the same
+        manner as :py:meth:`send_cmd()`. If an :py:exc:`IOError` occurs, responses to
+        subsequent commands are left unread.
+        """
+        pending = []
+        for item in items:
+            cmd_str, data = item[0], item[1]
+            expected_resp_size = item[2] if len(item) > 2 else -1
+            expected_resp = item[3] if len(item) > 3 else None
+
+            cmd, request = self._build_request(cmd_str, data)
+            pending.append((cmd_str, cmd, request, expected_resp_size, expected_resp))
+
+        responses = []
+        start = 0
+        while start < len(pending):
+            # Group as many requests as we can without exceeding our batch size limit
+            end = start + 1
+            group_size = len(pending[start][2])
+            while end < len(pending) and group_size + len(pending[end][2]) <= self._max_batch_request_size:
+                group_size += len(pending[end][2])
+                end += 1
+
+            group = pending[start:end]
+            self._ser_write(b''.join(entry[2] for entry in group))
+
+            for (cmd_str, cmd, _, expected_resp_size, expected_resp) in group:
+                responses.append(self._read_response(cmd_str, cmd, expected_resp_size, expected_resp))
+
+            start = end
+
+        return responses
+
     def close(self):
         """
         Close the connection to the Companion device.
@@ -4,6 +4,7 @@
 Functionality for interacting with a U-Boot console.
 """
 
+import codecs
 import os
 import re
 import time
@@ -52,6 +53,17 @@ class Console:
     this mode of operation will send each byte with a single write() + flush(),
     incurring non-negligible overhead.  You may set a value of 0 to incur only this
     implicit overhead, with no additional sleep()-based delay.
+
+    If the target can tolerate short bursts of data (i.e. its UART has a FIFO deeper than a single
+    byte), the *intrachar_chunk* keyword argument can be used to write data in chunks of that many
+    bytes, with a proportionally longer delay between chunks. This preserves the same average
+    data rate, while reducing the per-byte overhead described above. This defaults to 1.
+
+    Where supported (e.g. Linux), the serial port is placed into a "low latency" mode, in which
+    the host's UART driver delivers received data immediately, rather than briefly buffering it.
+    This can substantially reduce the round-trip time of each console command. To disable this,
+    provide a *low_latency=False* keyword argument or set a *DEPTHCHARGE_CONSOLE_LOW_LATENCY=0*
+    environment variable. (The latter takes precedence.)
     """
     def __init__(self, device='/dev/ttyUSB0:115200', prompt=None, monitor=None, **kwargs):
 
@@ -71,25 +83,39 @@ class Console:
         if intrachar_env is not None:
             self._intrachar = float(intrachar_env)
 
+        self._intrachar_chunk = kwargs.pop('intrachar_chunk', 1)
+        if not isinstance(self._intrachar_chunk, int) or self._intrachar_chunk < 1:
+            raise ValueError('intrachar_chunk must be a positive integer')
+
+        self._low_latency = kwargs.pop('low_latency', True)
+
+        low_latency_env = os.getenv('DEPTHCHARGE_CONSOLE_LOW_LATENCY')
+        if low_latency_env is not None:
+            self._low_latency = low_latency_env.strip().lower() not in ('0', 'false', 'no', 'off', '')
+
         # Parse device string and merge its entries into the provided kwargs,
         # giving priority to the items in the device string.
         device, device_args = str_to_property_keyval(device)
-        for arg in list(device_args.keys()):
+        for arg, value in device_args.items():
 
             # Special case - baudrate allowed without 'baudrate=' syntax
             # for convenience.
-            if isinstance(device_args[arg], bool):
+            if isinstance(value, bool):
                 try:
                     kwargs['baudrate'] = int(arg)
-                    device_args.pop(arg)
                 except ValueError:
                     pass
 
-            else:
+            # Values are already converted to int where possible.
+            # Only remaining strings need a second look.
+            elif isinstance(value, str):
                 try:
-                    kwargs[arg] = int(device_args[arg])
+                    kwargs[arg] = int(value)
                 except ValueError:
-                    kwargs[arg] = device_args[arg]
+                    kwargs[arg] = value
+
+            else:
+                kwargs[arg] = value
 
         # If, when Depthcharge is trying to detect a prompt at the console,
         # we see a match for this regular expression, we will enter a
@@ -104,15 +130,19 @@ class Console:
         self._reboot_re = kwargs.pop('reboot_re', None)
         self._reboot_cmd = kwargs.pop('reboot_cmd', 'reboot || shutdown -r now')
 
+        self._encoding = 'latin-1'
+
         if self._reboot_re:
-            self._reboot_re = re.compile(self._reboot_re)
             msg = (
                 'Using regular expression for reboot match trigger: '
-                + self._reboot_re.pattern + '\n'
+                + self._reboot_re + '\n'
                 + '    Will use this command: ' + self._reboot_cmd
             )
             log.note(msg)
 
+            # Matched against raw console data in discover_prompt()
+            self._reboot_re = re.compile(self._reboot_re.encode(self._encoding))
+
         # We're going to pass this off to the Serial constructor in a moment.
         if 'baudrate' not in kwargs:
             self._baudrate = 115200
@@ -124,8 +154,12 @@ class Console:
         self._dev = device
         self._kwargs = kwargs
 
-        self._ser = serial.Serial(port=self._dev, **kwargs)
-        self._encoding = 'latin-1'
+        self._ser = self._open_serial()
+
+        # Resolved once, rather than via the codec registry on each read
+        self._decode = codecs.getdecoder(self._encoding)
+
+        self._reboot_cmd_raw = (self._reboot_cmd + '\n').encode(self._encoding)
 
         self.monitor = monitor if monitor is not None else Monitor()
         self.prompt  = prompt
@@ -146,6 +180,20 @@ class Console:
         """
         return self._baudrate
 
+    @property
+    def prompt(self):
+        """
+        Expected U-Boot console prompt string. ``None`` if not yet known.
+        """
+        return self._prompt
+
+    @prompt.setter
+    def prompt(self, value):
+        self._prompt = value
+
+        # Encoded form, used to check for the prompt in raw console data
+        self._prompt_bytes = None if value is None else value.encode(self._encoding)
+
     def send_command(self, cmd: str, read_response=True) -> str:
         """
         Send the provided command (`cmd`) to the attached U-Boot console.
@@ -157,26 +205,124 @@ class Console:
         set to `True` and simply ignore the return value; this will ensure
         response data is removed from underlying buffers.
         """
-        self._ser.flush()
+        self._flush()
 
         if not cmd.endswith('\n'):
             cmd += '\n'
 
-        self.write(cmd)
-        self._ser.flush()
+        cmd_raw = cmd.encode(self._encoding)
+        self.write_raw(cmd_raw)
+        self._flush()
 
         if read_response:
-            resp = self.read()
-            resp = self.strip_echoed_input(cmd, resp)
+            # Echoed input and the trailing prompt are removed from the raw
+            # response, such that only the remaining data is decoded.
+            resp = self.read_raw().replace(b'\r\n', b'\n')
+
+            cmd_raw = cmd_raw.rstrip()
+            if resp.startswith(cmd_raw):
+                resp = resp[len(cmd_raw):].lstrip()
 
             # We expect this
-            if resp.endswith(self.prompt):
-                resp = resp[:-len(self.prompt)]
+            if resp.endswith(self._prompt_bytes):
+                resp = resp[:-len(self._prompt_bytes)]
 
-            return resp
+            return self._decode(resp)[0]
 
         return None
 
+    # Maximum amount of command input, in bytes, sent in a single write by
+    # send_command_batch(). This bounds how much typed-ahead input the target's
+    # UART must hold while U-Boot executes the first command of each write.
+    _max_batch_input_size = 64
+
+    def send_command_batch(self, cmds: list) -> list:
+        """
+        Send multiple commands (`cmds`) to the attached U-Boot console and return a list
+        containing their responses, in the same order.
+
+        Rather than waiting for each command's response before sending the next,
+        commands are written in groups of up to 64 bytes, and each group's output is
+        then read back. Output is split into individual responses at each occurrence
+        of the prompt string. As such, this should not be used with commands
+        whose output may itself contain the prompt string.
+
+        Note that U-Boot only consumes console input while waiting at its prompt.
+        Input that arrives while a command is executing must be held by the target's
+        UART, which may drop characters if its FIFO fills. The group size limit keeps
+        this typed-ahead input short, but some targets may still require the
+        *intrachar* setting described above.
+
+        An :py:exc:`IOError` is raised if responses to all commands are not received,
+        or if the output cannot be unambiguously split into individual responses.
+        """
+        cmds = [cmd if cmd.endswith('\n') else cmd + '\n' for cmd in cmds]
+
+        responses = []
+        start = 0
+        while start < len(cmds):
+            # Group as many commands as we can without exceeding our batch size limit
+            end = start + 1
+            group_size = len(cmds[start])
+            while end < len(cmds) and group_size + len(cmds[end]) <= self._max_batch_input_size:
+                group_size += len(cmds[end])
+                end += 1
+
+            responses.extend(self._send_command_group(cmds[start:end]))
+            start = end
+
+        return responses
+
+    def _send_command_group(self, cmds: list) -> list:
+        """
+        Helper for send_command_batch() that sends the newline-terminated
+        commands in `cmds` in a single write and returns their responses.
+        """
+        self._flush()
+        self.write(''.join(cmds))
+        self._flush()
+
+        prompt = self._prompt_bytes
+        chunks = []
+        prompt_count = 0
+        tail = b''
+
+        # Keep reading until we've seen a prompt following each command,
+        # or until the device stops responding.
+        #
+        # Prompts are counted within each new chunk, prefixed with the end of
+        # the previous one, such that a prompt spanning two chunks is not missed.
+        # The retained tail never includes part of a prompt that was already counted.
+        #
+        # Raw data is joined, normalized, and decoded only once at the end,
+        # such that a line ending spanning two chunks is also handled.
+        while prompt_count < len(cmds):
+            data = self.read_raw()
+            if not data:
+                break
+
+            chunks.append(data)
+            window = tail + data
+            prompt_count += window.count(prompt)
+
+            tail_start = max(0, len(window) - len(prompt) + 1)
+            last = window.rfind(prompt)
+            if last >= 0:
+                tail_start = max(tail_start, last + len(prompt))
+            tail = window[tail_start:]
+
+        resp = self._decode(b''.join(chunks).replace(b'\r\n', b'\n'))[0]
+        segments = resp.split(self.prompt)
+        if len(segments) <= len(cmds):
+            msg = 'Received responses to {:d} of {:d} commands'
+            raise IOError(msg.format(len(segments) - 1, len(cmds)))
+
+        if len(segments) > len(cmds) + 1:
+            msg = 'Received {:d} prompts for {:d} commands. Unable to separate responses.'
+            raise IOError(msg.format(len(segments) - 1, len(cmds)))
+
+        return [self.strip_echoed_input(cmd, seg) for (cmd, seg) in zip(cmds, segments)]
+
     def interrupt(self, interrupt_str='\x03', timeout=30.0):
         """
         Attempt to interrupt U-Boot and retrieve a console prompt.
@@ -190,23 +336,26 @@ class Console:
         `CONFIG_AUTOBOOT_KEYED` and `CONFIG_AUTOBOOT_STOP_STR` configuration
         options for more information.
         """
-        self._ser.flush()
+        self._flush()
 
         if self.prompt is None or len(self.prompt) == 0:
             log.note('No user-specified prompt provided. Attempting to determine this.')
             return self.discover_prompt(interrupt_str, timeout)
 
-        ret = ''
+        # Responses are kept as raw bytes and checked against our encoded prompt,
+        # such that we only need to decode data once we've found it.
+        interrupt_raw = interrupt_str.encode(self._encoding)
+        ret = []
         t_start = time.time()
         now = t_start
         while (now - t_start) < timeout:
-            self.write(interrupt_str)
-            self._ser.flush()
+            self.write_raw(interrupt_raw)
+            self._flush()
 
-            response = self.read()
-            ret += response
-            if response.endswith(self.prompt):
-                return ret
+            response = self.read_raw().replace(b'\r\n', b'\n')
+            ret.append(response)
+            if response.endswith(self._prompt_bytes):
+                return self._decode(b''.join(ret))[0]
 
             now = time.time()
         raise TimeoutError('Timed out while attempting to return to U-Boot console prompt')
@@ -219,27 +368,32 @@ class Console:
         t_start = time.time()
         now = t_start
 
-        ret = ''
-        candidate = ''
+        ret = []
+        candidate = b''
         candidate_count = 0
 
+        # Responses are handled as raw bytes. Only the identified prompt and
+        # the accumulated output are decoded.
+        interrupt_raw = interrupt_str.encode(self._encoding)
+        interrupt_ind_raw = self.interrupt_ind.encode(self._encoding)
+
         while (now - t_start) < timeout:
-            self.write(interrupt_str)
-            self._ser.flush()
+            self.write_raw(interrupt_raw)
+            self._flush()
 
-            response = self.read().replace(self.interrupt_ind, '')
-            ret += response
+            response = self.read_raw().replace(b'\r\n', b'\n').replace(interrupt_ind_raw, b'')
+            ret.append(response)
             response = response.lstrip().splitlines()
 
             # We want to see the same thing repeated <count> times,
             # with no other output emitted in between
             if len(response) != 1:
-                candidate = ''
+                candidate = b''
                 candidate_count = 0
                 continue
             response = response[0]
 
-            if candidate in ('', candidate):
+            if candidate in (b'', candidate):
                 candidate = response
                 candidate_count += 1
 
@@ -250,19 +404,20 @@ class Console:
                     # If so, attempt to issue 'reboot' command.
                     response_stripped = response.strip()
                     if self._reboot_re is not None and self._reboot_re.match(response_stripped):
-                        candidate = ''
+                        candidate = b''
                         candidate_count = 0
-                        msg = 'Attempting reboot. Matched reboot regex: ' + response_stripped
-                        log.note(msg)
-                        self.write(self._reboot_cmd + '\n')
-                        self._ser.flush()
+                        msg = 'Attempting reboot. Matched reboot regex: '
+                        log.note(msg + self._decode(response_stripped)[0])
+                        self.write_raw(self._reboot_cmd_raw)
+                        self._flush()
 
                     if candidate_count > 0:
-                        log.note('Identified prompt: ' + response)
-                        self.prompt = response
-                        return ret
+                        prompt = self._decode(response)[0]
+                        log.note('Identified prompt: ' + prompt)
+                        self.prompt = prompt
+                        return self._decode(b''.join(ret))[0]
             else:
-                candidate = ''
+                candidate = b''
                 candidate_count = 0
 
             now = time.time()
@@ -279,7 +434,7 @@ class Console:
         data = self._ser.readline()
         if update_monitor:
             self.monitor.read(data)
-        return data.decode(self._encoding)
+        return self._decode(data)[0]
 
     def read(self, readlen=64, update_monitor=True) -> str:
         """
@@ -289,8 +444,10 @@ class Console:
         :py:class:`~depthcharge.monitor.Monitor`.
         """
         raw_data = self.read_raw(readlen, update_monitor=update_monitor)
-        ret_str  = raw_data.decode(self._encoding)
-        return ret_str.replace('\r\n', '\n')
+
+        # Our single-byte encoding allows line endings to be normalized
+        # prior to decoding, yielding only one new str.
+        return self._decode(raw_data.replace(b'\r\n', b'\n'))[0]
 
     def read_raw(self, readlen=64, update_monitor=True) -> bytes:
         """
@@ -299,15 +456,24 @@ class Console:
         If `update_monitor` is `True`, this data is recorded by any attached
         :py:class:`~depthcharge.monitor.Monitor`.
         """
-        ret = b''
+        chunks = []
         data = None
 
         # serial.Serial.read_until() enforces the read timeout at the
         # granularity of the entire payload, rather than a read() timeout.
         # This causes us to time out when reading large responses.
+        #
+        # Chunks are joined once at the end, rather than repeatedly
+        # copying an ever-growing bytes object.
+        #
+        # Whatever has already been received is drained in a single read.
+        # Only when nothing is pending do we block (for up to the timeout)
+        # in a readlen-sized read, which ends the loop once no more data arrives.
         while data != b'':
-            data = self._ser.read(readlen)
-            ret += data
+            data = self._ser_read(max(readlen, self._ser.in_waiting))
+            chunks.append(data)
+
+        ret = b''.join(chunks)
 
         if update_monitor:
             self.monitor.read(ret)
@@ -331,20 +497,39 @@ class Console:
         :py:class:`~depthcharge.monitor.Monitor`.
         """
         if self._intrachar is None:
-            self._ser.write(data)
+            self._ser_write(data)
+            self._tx_dirty = True
         else:
-            for b in data:
-                # A value of 0 will induce only the overhead of a per-byte
+            # Slicing the view yields chunks without copying or
+            # per-byte int -> bytes conversions.
+            view = memoryview(data)
+            chunk = self._intrachar_chunk
+            delay = self._intrachar * chunk
+
+            for i in range(0, len(view), chunk):
+                # A value of 0 will induce only the overhead of a per-chunk
                 # write() + flush()... which is quite substantial.
-                if self._intrachar > 0:
-                    time.sleep(self._intrachar)
+                #
+                # This overhead is intentional. The flush() waits for each chunk
+                # to be transmitted, which is what paces the output.
+                if delay > 0:
+                    time.sleep(delay)
 
-                self._ser.write(b.to_bytes(1, 'little'))
-                self._ser.flush()
+                self._ser_write(view[i:i + chunk])
+                self._ser_flush()
 
         if update_monitor:
             self.monitor.write(data)
 
+    def _flush(self):
+        """
+        Wait for data written to the serial console to be transmitted,
+        if any has been written since our last flush.
+        """
+        if self._tx_dirty:
+            self._ser_flush()
+            self._tx_dirty = False
+
     def close(self, close_monitor=True):
         """
         Close the serial console connection.
@@ -366,7 +551,31 @@ class Console:
         created with. After this function returns successfully, the object may
         be used again.
         """
-        self._ser = serial.Serial(port=self._dev, **self._kwargs)
+        self._ser = self._open_serial()
+
+    def _open_serial(self):
+        """
+        Open and return the underlying serial port, configured according to the
+        arguments provided to the constructor.
+        """
+        ser = serial.Serial(port=self._dev, **self._kwargs)
+
+        # Nothing has been written to the new port that would need to be flushed
+        self._tx_dirty = False
+
+        # Bound once here, rather than looked up on each call in our read/write loops
+        self._ser_read = ser.read
+        self._ser_write = ser.write
+        self._ser_flush = ser.flush
+
+        if self._low_latency:
+            try:
+                ser.set_low_latency_mode(True)
+            except (AttributeError, NotImplementedError, OSError, ValueError) as e:
+                # Not supported by this platform, driver, or device type
+                log.debug('Unable to enable serial port low latency mode: ' + str(e))
+
+        return ser
 
     @staticmethod
     def strip_echoed_input(input_str: str, output: str) -> str:
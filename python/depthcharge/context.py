@@ -72,7 +72,6 @@ import json
 import os
 import re
 
-from copy import deepcopy
 from datetime import datetime
 
 from .version import __version__
@@ -102,6 +101,21 @@ _FAILURE_STRINGS = (
 )
 
 
+def _copy_plain(value):
+    """
+    Copy a structure composed of dicts, lists, and immutable values (e.g. str, int),
+    such as the JSON-serializable information cached by a Depthcharge context.
+    This avoids the overhead of deepcopy(), which is not needed for such data.
+    """
+    if isinstance(value, dict):
+        return {k: _copy_plain(v) for (k, v) in value.items()}
+
+    if isinstance(value, list):
+        return [_copy_plain(v) for v in value]
+
+    return value
+
+
 class Depthcharge:
     """
     This class represents a context handle for the top-level target interaction API.
@@ -121,6 +135,14 @@ class Depthcharge:
         keyword argument to the constructor or by making a later call to
         :py:meth:`commands()` with *detailed=True*.
 
+    :Batched initialization: By default, the Depthcharge constructor retrieves the target's
+        command list, environment, and version information one command at a time. If
+        *batch_init=True* is specified, these commands are instead sent together via
+        :py:meth:`send_command_batch()`, falling back to individual commands if this fails.
+        This saves time on targets that reliably accept typed-ahead input, but may yield
+        incorrect results on those that drop characters or whose output contains
+        the prompt string. It has no effect when *detailed_help=True*.
+
     :Allow payload deployment & execution: If *allow_deploy=True*, Depthcharge will attempt
         to deploy and execute payloads in memory, when neccessary. Specifying
         *allow_deploy=True* will always force payloads to be deployed; this overrides
@@ -162,6 +184,7 @@ class Depthcharge:
 
     _default_arch = 'generic'  # 32-bit, little endian
     _ver_re   = re.compile(r'^U-Boot\s+[0-9]{4}\.[0-9]{2}')
+    _help_re  = re.compile(r'(?P<cmd>[a-zA-Z0-9_]+)\s*-?\s*(?P<summary>.*)')
 
     def __init__(self, console, companion=None, **kwargs):
         self.args = kwargs
@@ -201,8 +224,9 @@ class Depthcharge:
         if self.console.prompt is not None:
             log.note('Expected U-Boot prompt: ' + self.console.prompt)
 
-        # Available commands
+        # Available commands, and whether they include detailed help text
         self._cmds = kwargs.get('_cmds', None)
+        self._cmds_detailed = bool(self._cmds) and all('details' in entry for entry in self._cmds.values())
 
         # Executable payloads we can jump into
         # "Standalone Applications" in U-Boot parlance
@@ -287,8 +311,16 @@ class Depthcharge:
         self.console.interrupt()
 
         # Read and cache available commands and environment variables
-        # if we didn't already pull them in from "private" keyword args
-        self.commands(detailed=kwargs.get('detailed_help', False))
+        # if we didn't already pull them in from "private" keyword args.
+        #
+        # If requested, we first attempt to retrieve all of this (and version information)
+        # in a single batch of commands. The following calls will pick up where this leaves off.
+        detailed_help = kwargs.get('detailed_help', False)
+        batch_init = kwargs.get('batch_init', False)
+        if batch_init and self._cmds is None and self._env is None and self._version is None and not detailed_help:
+            self._read_target_info_batch()
+
+        self.commands(detailed=detailed_help)
         self.environment()
 
         # Establish our payload base address by resolving either an environment
@@ -326,6 +358,42 @@ class Depthcharge:
         except OperationNotSupported as error:
             log.warning(str(error))
 
+    def _read_target_info_batch(self):
+        """
+        Helper for _perform_active_init() that retrieves command, environment, and version
+        information using a single batch of console commands, rather than waiting on
+        each in turn.
+
+        If any of this cannot be obtained, the corresponding cached information is left
+        unpopulated so that it may be retrieved individually afterwards.
+        """
+        log.note('Retrieving command list, environment, and version via "help", "printenv", "version"')
+
+        try:
+            help_text, env_text, version_text = self.console.send_command_batch(['help', 'printenv', 'version'])
+
+            # Failure strings here suggest that U-Boot didn't receive the commands intact.
+            self._check_response_for_error(help_text)
+            self._check_response_for_error(env_text)
+            cmds = self._parse_help(help_text)
+        except (IOError, OperationFailed) as e:
+            log.debug('Falling back to individual commands: ' + str(e))
+
+            # Return to a known state, in case of any further pending output
+            self.console.interrupt()
+            return
+
+        self._cmds = cmds
+        self._cmds_detailed = False
+        self._parse_environment(env_text)
+
+        try:
+            self._check_response_for_error(version_text)
+            if 'version' in cmds:
+                self._parse_version(version_text)
+        except OperationFailed as e:
+            log.debug('Unexpected version command response: ' + str(e))
+
     def _resolve_payload_base(self):
         """
         Resolve self._payload_base string based upon environment vars, if needed.
@@ -498,22 +566,38 @@ class Depthcharge:
                 raise OperationFailed(resp)
 
     @staticmethod
-    def load(filename: str, console, **kwargs):
+    def load(filename, console, **kwargs):
         """
         Create and return a Depthcharge object from the JSON data included in the
         specified file, previously generated by :py:meth:`save()`.
+
+        The *filename* argument may alternatively be an open, readable file-like object
+        (e.g. :py:class:`io.BytesIO`), in which case its contents are consumed in a single read.
         """
-        with open(filename, 'r') as infile:
+        if hasattr(filename, 'read'):
+            return Depthcharge.from_json(filename.read(), console, **kwargs)
+
+        with open(filename, 'rb') as infile:
             return Depthcharge.from_json(infile.read(), console, **kwargs)
 
     @classmethod
-    def from_json(cls, json_str: str, console, **kwargs):
+    def from_json(cls, json_str, console, **kwargs):
         """
         Create and return a Context object from the provided JSON data,
         previously created by :py:meth:`to_json()`.
+
+        The *json_str* may be provided as either a :py:class:`str` or UTF-8 encoded :py:class:`bytes`.
+        """
+        return cls.from_dict(json.loads(json_str), console, **kwargs)
+
+    @classmethod
+    def from_dict(cls, ctx: dict, console, **kwargs):
         """
-        ctx = json.loads(json_str)
+        Create and return a Context object from a dictionary containing the deserialized
+        contents of JSON data previously created by :py:meth:`to_json()`.
 
+        The new context takes ownership of the items in *ctx*; they are not copied.
+        """
         # Allow these items to be overridden on load
         if 'payload_base' not in kwargs and 'payload_base' in ctx:
             kwargs['payload_base'] = ctx['payload_base']
@@ -530,10 +614,9 @@ class Depthcharge:
                    _gd=ctx['gd'],
                    **kwargs)
 
-    def to_json(self, timestamp=True, comment=None, **kwargs) -> str:
+    def _to_dict(self, timestamp: bool, comment) -> dict:
         """
-        Serialize a depthcharge Depthcharge object so that it can be later recreated
-        via the :py:meth:`from_json()` method.
+        Return a dictionary containing the items serialized by :py:meth:`to_json()`.
         """
         output = {
             'arch': self.arch.name,
@@ -554,22 +637,51 @@ class Depthcharge:
             output['depthcharge_comment'] = comment
 
         output['depthcharge_version'] = __version__
+        return output
 
+    def to_json(self, timestamp=True, comment=None, **kwargs) -> str:
+        """
+        Serialize a depthcharge Depthcharge object so that it can be later recreated
+        via the :py:meth:`from_json()` method.
+        """
         # Default to a human readable file
         if 'indent' not in kwargs:
             kwargs['indent'] = 4
 
-        return json.dumps(output, **kwargs)
+        return json.dumps(self._to_dict(timestamp, comment), **kwargs)
 
     def save(self, filename, timestamp=True, comment=None):
         """
         Serialize the current configuration of the current Depthcharge context
         to a JSON object and write it to the provided filename.
+
+        The *filename* argument may alternatively be an open, writable text file-like object
+        (e.g. :py:class:`io.StringIO`).
+
+        The JSON data is written as it is produced, rather than first being
+        built up in its entirety. When a filename is provided, this data is
+        written to a temporary file that replaces *filename* only once complete.
+        As a result, a failure will not clobber a previously saved configuration.
         """
+        output = self._to_dict(timestamp, comment)
+
+        if hasattr(filename, 'write'):
+            json.dump(output, filename, indent=4)
+            return
+
         log.note('Saving depthcharge configuration state to ' + filename)
-        s = self.to_json(timestamp, comment)
-        with open(filename, 'w') as outfile:
-            outfile.write(s)
+
+        tmp_filename = '{:s}.{:d}.tmp'.format(filename, os.getpid())
+        try:
+            with open(tmp_filename, 'w') as outfile:
+                json.dump(output, outfile, indent=4)
+            os.replace(tmp_filename, filename)
+        except BaseException:
+            try:
+                os.remove(tmp_filename)
+            except OSError:
+                pass
+            raise
 
     @property
     def prompt(self) -> str:
@@ -597,6 +709,10 @@ class Depthcharge:
         :py:meth:`re.match()` will be applied to the response. A :py:exc:`ValueError` will
         be raised if the response does not match the provided pattern.
 
+        Alternatively, a regular expression may be provided as a string by including an
+        *expected_regex=True* keyword argument. Compiled patterns are cached by the :py:mod:`re`
+        module, so repeatedly sending commands with the same expression remains inexpensive.
+
         **Example:** *Retrieving a Device Tree from NAND*
 
         .. code:: python
@@ -620,6 +736,9 @@ class Depthcharge:
         check = kwargs.pop('check', False)
         expected = kwargs.pop('expected', None)
 
+        if kwargs.pop('expected_regex', False) and isinstance(expected, str):
+            expected = re.compile(expected)
+
         resp = self.console.send_command(*args, **kwargs)
         if resp is not None:
             if check:
@@ -629,7 +748,11 @@ class Depthcharge:
                 failure = False
 
                 if isinstance(expected, str):
-                    failure = resp.lower().strip() != expected.lower().strip()
+                    # Console data is decoded as latin-1, for which lower() preserves length.
+                    # Mismatched lengths are therefore caught before lowercasing the response.
+                    expected = expected.lower().strip()
+                    resp_stripped = resp.strip()
+                    failure = len(resp_stripped) != len(expected) or resp_stripped.lower() != expected
                 elif isinstance(expected, re.Pattern):
                     failure = not expected.match(resp.strip())
                 else:
@@ -644,6 +767,25 @@ class Depthcharge:
 
         return resp
 
+    def send_command_batch(self, cmds: list, check=False) -> list:
+        """
+        Send multiple commands to the target console in a single write and return
+        a list containing their responses, in the same order.
+
+        Refer to :py:meth:`depthcharge.Console.send_command_batch()` for caveats
+        regarding the use of this method.
+
+        If *check=True*, each response is checked for strings indicative of a failure,
+        in the same manner as :py:meth:`send_command()`.
+        """
+        responses = self.console.send_command_batch(cmds)
+
+        if check:
+            for resp in responses:
+                self._check_response_for_error(resp)
+
+        return responses
+
     def interrupt(self, interrupt_str='\x03', timeout=30.0):
         """
         This is a convenience wrapper around :py:meth:`depthcharge.Console.interrupt()`.
@@ -664,49 +806,25 @@ class Depthcharge:
         text is stored in a *details* value.
         """
 
-        if self._cmds is not None and cached:
-            if not detailed:
-                # We may or may not have detailed info. Excess info
-                # is fine; the user can ignore it.
-                return deepcopy(self._cmds)
-
-            # Use any command to determine if we have detailed help info
-            name = list(self._cmds)[0]
-            have_details = 'details' in self._cmds[name]
-
-            # We have the requested details
-            if have_details:
-                return deepcopy(self._cmds)
-
-            # Otherwise, we need to carry on to collect more info.
-
-        regex = re.compile(r'(?P<cmd>[a-zA-Z0-9_]+)\s*-?\s*(?P<summary>.*)')
+        # We may or may not have detailed info when it's not requested.
+        # Excess info is fine; the user can ignore it. Otherwise, we
+        # need to carry on to collect more info.
+        if self._cmds is not None and cached and (self._cmds_detailed or not detailed):
+            return self._copy_cmds()
 
         if detailed:
             log.note('Retrieving detailed command info via "help"')
         else:
             log.note('Retrieving command list via "help"')
 
-        cmds = {}
-        help_text = self.send_command('help')
-        for line in help_text.splitlines():
-            entry = {}
-            m = regex.match(line)
-            if m is not None:
-                cmd = m.group('cmd')
-                entry['summary'] = m.group('summary')
-
-                cmds[cmd] = entry
-
-        if not cmds:
-            raise IOError("Failed to retrieve command list via help")
+        cmds = self._parse_help(self.send_command('help'))
 
         if detailed:
             desc = 'Reading console command help text'
             unit = 'cmd'
             progress = self.create_progress_indicator(self, len(cmds), desc, unit=unit)
             try:
-                for cmd in cmds:
+                for cmd, entry in cmds.items():
                     log.debug('Reading help text for: ' + cmd)
                     progress.update()
                     entry['details'] = self.send_command('help ' + cmd)
@@ -715,7 +833,33 @@ class Depthcharge:
 
         # Update write-through cache
         self._cmds = cmds
-        return deepcopy(self._cmds)
+        self._cmds_detailed = detailed
+        return self._copy_cmds()
+
+    def _parse_help(self, help_text: str) -> dict:
+        """
+        Parse the output of the console ``help`` command into a dictionary,
+        in the form returned by :py:meth:`commands()`.
+        """
+        cmds = {}
+        for line in help_text.splitlines():
+            m = self._help_re.match(line)
+            if m is not None:
+                cmds[m.group('cmd')] = {'summary': m.group('summary')}
+
+        if not cmds:
+            raise IOError("Failed to retrieve command list via help")
+
+        return cmds
+
+    def _copy_cmds(self) -> dict:
+        """
+        Return a copy of our cached command information.
+
+        Each entry contains only str values, so copying each entry's
+        dictionary is sufficient to yield a deep copy.
+        """
+        return {name: dict(entry) for (name, entry) in self._cmds.items()}
 
     def environment(self, cached=True) -> dict:
         """
@@ -736,16 +880,19 @@ class Depthcharge:
         log.note('Reading environment via "printenv"')
 
         self.console.interrupt()
-        env_text = self.send_command('printenv')
+        self._parse_environment(self.send_command('printenv'))
+        return self._env
 
+    def _parse_environment(self, env_text: str):
+        """
+        Parse the output of the console ``printenv`` command and update our cached environment.
+        """
         try:
             self._env = uboot.env.parse(env_text)
         except ValueError as e:
             log.error('Failed to parse environment: ' + str(e))
             self._env = {}
 
-        return self._env
-
     def env_var(self, name: str, expand=True, cached=True, convert_int=True, **kwargs):
         """
         Retrieve the value of an environment variable, specified by *name*.
@@ -793,21 +940,35 @@ class Depthcharge:
         The *invalidate_cache* argument forces readback of the entire environment
         into Depthcharge's local cache when set to ``True.``  When setting a handful
         of variables in succession, you may set it to ``False`` for all but the final
-        :py:meth:`set_env_var()` call.
+        :py:meth:`set_env_var()` call, or use :py:meth:`set_env_vars()` instead.
 
         """
-        if isinstance(value, int):
-            value = '0x{:08x}'.format(value)
-        elif isinstance(value, str):
-            pass
-        else:
-            raise TypeError('Value must be a string or integer. Got ' + type(value).__name__)
+        self.set_env_vars({name: value}, invalidate_cache)
+
+    def set_env_vars(self, items: dict, invalidate_cache=True):
+        """
+        Set multiple environment variables, specified as a dictionary mapping
+        variable names to values. Values are handled as described in :py:meth:`set_env_var()`.
+
+        When *invalidate_cache* is ``True``, the environment is read back from the
+        target once, after all variables have been set.
+        """
+        # Validate everything before modifying any state on the target
+        settings = []
+        for name, value in items.items():
+            if isinstance(value, int):
+                value = '0x{:08x}'.format(value)
+            elif not isinstance(value, str):
+                raise TypeError('Value must be a string or integer. Got ' + type(value).__name__)
+
+            settings.append((name, value))
 
-        self.send_command('setenv ' + name + ' ' + value, check=True)
-        log.note('Set environment variable: {:s}={:s}'.format(name, value))
+        for name, value in settings:
+            self.send_command('setenv ' + name + ' ' + value, check=True)
+            log.note('Set environment variable: {:s}={:s}'.format(name, value))
 
         # Re-read entire environment so we can update out cache and expand future vars appropriately
-        if invalidate_cache:
+        if invalidate_cache and settings:
             # cached=False forces update of self._env
             self.environment(cached=False)
 
@@ -827,10 +988,7 @@ class Depthcharge:
 
         if 'version' in self._cmds:
             # Preferred, as we get some compiler and linker versions
-            resp = self.console.send_command('version')
-            self._version = resp.splitlines()
-            if len(self._version) >= 1:
-                log.note('Version: ' + self._version[0])
+            self._parse_version(self.console.send_command('version'))
             return self._version
 
         if 'reset' in self._cmds and allow_reset:
@@ -852,6 +1010,14 @@ class Depthcharge:
         self._version = ['unknown']
         return self._version
 
+    def _parse_version(self, resp: str):
+        """
+        Record the output of the console ``version`` command as our version information.
+        """
+        self._version = resp.splitlines()
+        if len(self._version) >= 1:
+            log.note('Version: ' + self._version[0])
+
     @property
     def register_readers(self):
         """
@@ -1044,6 +1210,11 @@ class Depthcharge:
         unexpected firmware revision. If this is not desired, checks can be disabled by providing a
         *skip_checks=True* keyword argument.
 
+        Expected values of contiguous or overlapping patches are verified using a single read.
+        To also group patches separated by up to *N* bytes, at the cost of reading the memory
+        between them, provide a *check_max_gap=N* keyword argument. Do not do this if
+        these regions may contain memory-mapped peripherals or unmapped addresses.
+
         Next, each patch's data will be written to their corresponding memory locations. If
         *dry_run=True*, this write step is skipped.
 
@@ -1078,10 +1249,12 @@ class Depthcharge:
             actual = type(patch_list).__name__
             raise TypeError('Expected MemoryPatchList, got: ' + actual)
 
-        avg_patch_size = 0
-        for patch in patch_list:
-            avg_patch_size += len(patch.value)
-        avg_patch_size //= len(patch_list)
+        n_patches = len(patch_list)
+        if n_patches == 0:
+            log.note('No patches to apply.')
+            return
+
+        avg_patch_size = sum(len(patch.value) for patch in patch_list) // n_patches
 
         # Both of theses helpers pop('impl'), so this is a bit of a kludge
         impl = kwargs.get('impl', None)
@@ -1090,14 +1263,17 @@ class Depthcharge:
 
         skip_checks = kwargs.get('skip_checks', False)
 
+        # Only applicable to our checks, rather than the memory writer
+        max_gap = kwargs.pop('check_max_gap', 0)
+
         do_writes = True
         if dry_run or not skip_checks:
-            do_writes = self._check_patch_expectations(read_impl, patch_list)
+            do_writes = self._check_patch_expectations(read_impl, patch_list, max_gap)
 
         if dry_run or not do_writes:
             return
 
-        progress = self.create_progress_indicator(self, len(patch_list), 'Applying patches')
+        progress = self.create_progress_indicator(self, n_patches, 'Applying patches')
         try:
             for i, patch in enumerate(patch_list):
                 # Setup operation only on the first write
@@ -1105,7 +1281,7 @@ class Depthcharge:
                 kwargs['suppress_setup'] = no_setup
 
                 # Teardown operation only on the final write
-                no_teardown = i < (len(patch_list) - 1)
+                no_teardown = i < (n_patches - 1)
                 kwargs['suppress_teardown'] = no_teardown
 
                 write_impl.write(patch.address, patch.value, **kwargs)
@@ -1221,7 +1397,7 @@ class Depthcharge:
         impl = self._exec_impl(kwargs)
         return impl.execute_at(address, *args, **kwargs)
 
-    def _check_patch_expectations(self, read_impl, patch_list, **kwargs):
+    def _check_patch_expectations(self, read_impl, patch_list, max_gap=0, **kwargs):
         matches_expected = 0
         already_applied  = 0
 
@@ -1230,43 +1406,51 @@ class Depthcharge:
 
         progress = self.create_progress_indicator(self, len(patch_list), desc, show=show)
 
-        # Pre-determine our first and last reads so that we can determine when we
-        # need to set the suppress_setup and supress_teardown flags.
-        first_read_idx = None
-        last_read_idx = None
-        for i, patch in enumerate(patch_list):
-            if patch.expected is not None:
-                if first_read_idx is None:
-                    first_read_idx = i
-                last_read_idx = i
+        # Group consecutive patches that we need to verify into runs, such that each run
+        # can be checked using a single read. By default, only contiguous or overlapping
+        # patches are grouped; memory between patches is read only if *max_gap* permits it.
+        checked = [p for p in patch_list if p.expected is not None]
+        runs = []
+        for patch in checked:
+            end = patch.address + len(patch.expected)
+            if runs and runs[-1][0] <= patch.address <= runs[-1][1] + max_gap:
+                runs[-1][1] = max(runs[-1][1], end)
+                runs[-1][2].append(patch)
+            else:
+                runs.append([patch.address, end, [patch]])
 
         try:
-            for i, patch in enumerate(patch_list):
-                if patch.expected is None:
-                    progress.update()
-                    continue
+            # Nothing to do for patches without an expected value
+            progress.update(len(patch_list) - len(checked))
 
+            for i, (start, end, patches) in enumerate(runs):
                 # Perform operation setup only on the first read
-                kwargs['suppress_setup'] = (i != first_read_idx)
+                kwargs['suppress_setup'] = (i != 0)
 
                 # Perform operation teardown only on the final read
-                kwargs['suppress_teardown'] = (i != last_read_idx)
-
-                read_data = read_impl.read(patch.address, len(patch.expected), **kwargs)
-                if read_data == patch.expected:
-                    log.debug(patch.description + ' matches expected pre-patch value.')
-                    matches_expected += 1
-                elif read_data == patch.value:
-                    log.debug(patch.description + ' is already patched.')
-                    already_applied  += 1
-                else:
-                    log.debug('Expected:  ' + patch.expected.hex())
-                    log.debug('Read data: ' + read_data.hex())
+                kwargs['suppress_teardown'] = (i != len(runs) - 1)
 
-                    err = patch.description + ' does not match expected value.'
-                    raise ValueError(err)
+                # Slices of this view are compared against patch data without creating copies
+                run_data = memoryview(read_impl.read(start, end - start, **kwargs))
 
-                progress.update()
+                for patch in patches:
+                    offset = patch.address - start
+                    read_data = run_data[offset:offset + len(patch.expected)]
+
+                    if read_data == patch.expected:
+                        log.debug(patch.description + ' matches expected pre-patch value.')
+                        matches_expected += 1
+                    elif read_data == patch.value:
+                        log.debug(patch.description + ' is already patched.')
+                        already_applied  += 1
+                    else:
+                        log.debug('Expected:  ' + patch.expected.hex())
+                        log.debug('Read data: ' + read_data.hex())
+
+                        err = patch.description + ' does not match expected value.'
+                        raise ValueError(err)
+
+                    progress.update()
 
         finally:
             self.close_progress_indicator(progress)
@@ -1321,7 +1505,7 @@ class Depthcharge:
         document for more information about the data structures and tables discussed above.
         """
         if '_done' in self._gd and cached:
-            ret = deepcopy(self._gd)
+            ret = _copy_plain(self._gd)
             ret.pop('_done')
             return ret
 
@@ -1341,7 +1525,7 @@ class Depthcharge:
                 log.warning(str(error))
 
         if self._gd:
-            ret = deepcopy(self._gd)
+            ret = _copy_plain(self._gd)
             self._gd['_done'] = True
             return ret
 
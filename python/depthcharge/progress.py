@@ -14,7 +14,6 @@ use of that corresponding functionality (e.g. tqdm).
 """
 
 from datetime import datetime
-from tqdm import tqdm
 
 from . import log
 
@@ -140,6 +139,9 @@ class ProgressBar(Progress):
         # Remove item not relevant to tqdm
         kwargs.pop('owner', None)
 
+        # Deferred until needed. This is among the slowest of our imports.
+        from tqdm import tqdm  # pylint: disable=import-outside-toplevel
+
         self._pbar = tqdm(total=total_operations, desc=desc, unit=unit, leave=False, **kwargs)
 
     def update(self, count=1):
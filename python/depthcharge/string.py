@@ -8,6 +8,8 @@ import os
 import re
 import sys
 
+from functools import lru_cache
+
 # Uppercase'd for case-insensitivity
 _BYTE_LENGTH_SUFFIXES = {
     'KB':   1000,
@@ -18,9 +20,16 @@ _BYTE_LENGTH_SUFFIXES = {
     'MIB':  1024 * 1024,
     'GB':   1000 * 1000 * 1000,
     'G':    1024 * 1024 * 1024,
-    'GiB':  1024 * 1024 * 1024,
+    'GIB':  1024 * 1024 * 1024,
 }
 
+# Splits an (uppercase'd, whitespace-free) length string into its value and suffix.
+_BYTE_LENGTH_RE = re.compile(
+    r'^(?P<value>.*?)(?P<suffix>' +
+    '|'.join(sorted(_BYTE_LENGTH_SUFFIXES, key=len, reverse=True)) +
+    r')$'
+)
+
 
 def to_positive_int(string: str, string_desc='', exit_on_fail=True) -> int:
     """
@@ -76,16 +85,13 @@ def length_to_int(len_str: str, desc='length', exit_on_fail=True) -> int:
         # Otherwise we'll handle it
         pass
 
-    _len_str = len_str.replace(' ', '').upper()
-
-    for suffix in _BYTE_LENGTH_SUFFIXES:
-        if _len_str.endswith(suffix):
-            factor = _BYTE_LENGTH_SUFFIXES[suffix]
-            val_str = _len_str[:-len(suffix)]
-            value = to_positive_int(val_str, desc, exit_on_fail)
-            return value * factor
+    match = _BYTE_LENGTH_RE.match(len_str.replace(' ', '').upper())
+    if match is None:
+        raise ValueError('Invalid ' + desc + ': ' + len_str)
 
-    raise ValueError('Invalid ' + desc + ': ' + len_str)
+    factor = _BYTE_LENGTH_SUFFIXES[match.group('suffix')]
+    value = to_positive_int(match.group('value'), desc, exit_on_fail)
+    return value * factor
 
 
 def keyval_list_to_dict(arg_list: list) -> dict:
@@ -101,30 +107,43 @@ def keyval_list_to_dict(arg_list: list) -> dict:
     """
     arg_dict = {}
     for arg in arg_list:
-        keyvals = arg.split(',')
-        for keyval in keyvals:
-            fields = keyval.split('=')
-            if len(fields) in (1, 2):
-                key = fields[0].strip()
-
-                if len(fields) == 1:
-                    # Just a boolean setting
-                    arg_dict[key] = True
-                else:
-                    # Attempt to interpret integer setting values
-                    value = fields[1].strip()
-                    try:
-                        arg_dict[key] = int(value, 0)
-                    except ValueError:
-                        arg_dict[key] = value
-            else:
-                keyval = '<empty>' if len(keyval) == 0 else keyval
-                err = 'Invalid argument. Expected key=val syntax: ' + keyval
-                raise ValueError(err)
+        arg_dict.update(_parse_keyval_str(arg))
 
     return arg_dict
 
 
+@lru_cache(maxsize=128)
+def _parse_keyval_str(arg: str) -> tuple:
+    """
+    Helper for :py:func:`keyval_list_to_dict()` that parses a single
+    ``'key1=val1,key2=val2,...'`` string into a tuple of ``(key, value)`` pairs.
+
+    Results are cached, and are therefore returned as immutable tuples.
+    """
+    items = []
+    for keyval in arg.split(','):
+        fields = keyval.split('=')
+        if len(fields) in (1, 2):
+            key = fields[0].strip()
+
+            if len(fields) == 1:
+                # Just a boolean setting
+                items.append((key, True))
+            else:
+                # Attempt to interpret integer setting values
+                value = fields[1].strip()
+                try:
+                    items.append((key, int(value, 0)))
+                except ValueError:
+                    items.append((key, value))
+        else:
+            keyval = '<empty>' if len(keyval) == 0 else keyval
+            err = 'Invalid argument. Expected key=val syntax: ' + keyval
+            raise ValueError(err)
+
+    return tuple(items)
+
+
 def str_to_property_keyval(arg: str) -> tuple:
     """
     Helper routine for converting a command-line argument string in the form:
@@ -149,8 +168,7 @@ def str_to_property_keyval(arg: str) -> tuple:
 
     main_item = arg[:separator_idx].strip()
     keyval_str = arg[separator_idx + 1:]
-    keyval_list = keyval_str.split(',')
-    return (main_item, keyval_list_to_dict(keyval_list))
+    return (main_item, keyval_list_to_dict((keyval_str,)))
 
 
 def xxd(address, data: bytes) -> str:
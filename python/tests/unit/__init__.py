@@ -9,6 +9,19 @@ from .checker import (
     TestUBootHeaderChecker
 )
 
+from .cmdline import (
+    TestArgumentParserInitArgs,
+    TestArgumentParserSniff,
+    TestKeyValListAction,
+    TestListAction
+)
+
+from .companion import TestCompanionSendBatch
+
+from .console import TestConsoleSendCommandBatch
+
+from .context import TestDepthchargePatchMemory, TestDepthchargeSetEnvVars
+
 from .hunter import (
     TestConstantHunter,
     TestGappedRangeIter,
@@ -26,7 +39,7 @@ from .operation import (
 from .revcrc32 import TestReverseCRC32
 
 # TODO: Implement tests for the rest of this submodule
-from .string import TestXxd
+from .string import TestLengthToInt, TestXxd
 
 
 # TODO: Implement tests for the rest of this subpackage:
@@ -6,6 +6,7 @@
 from unittest import TestCase
 
 from depthcharge.checker import SecurityRisk, SecurityImpact
+from depthcharge.uboot import UBootVersion
 
 
 class TestSecurityRisk(TestCase):
@@ -48,3 +49,31 @@ class TestSecurityRisk(TestCase):
         self.assertEqual(risk.source, 'test-srcx')
         self.assertEqual(risk.description, 'test-desc')
         self.assertEqual(risk.recommendation, 'test-rec')
+
+    @staticmethod
+    def _create_risk(affected_versions):
+        return SecurityRisk(identifier='ident',
+                            summary='summary',
+                            impact=SecurityImpact.INFO_LEAK,
+                            source='src',
+                            description='description',
+                            recommendation='recommendation',
+                            affected_versions=affected_versions)
+
+    def test_applicable_to_version(self):
+        for versions in (('2013.07', '2019.10'),
+                         (UBootVersion('2013.07'), UBootVersion('2019.10'))):
+            risk = self._create_risk(versions)
+            self.assertTrue(risk.applicable_to_version('2013.07'))
+            self.assertTrue(risk.applicable_to_version(UBootVersion('2016.01')))
+            self.assertFalse(risk.applicable_to_version('2013.04'))
+            self.assertFalse(risk.applicable_to_version('2020.01'))
+
+        risk = self._create_risk(None)
+        self.assertTrue(risk.applicable_to_version('2020.01'))
+
+    def test_invalid_affected_version(self):
+        # Not reported until the versions are actually used
+        risk = self._create_risk(('bogus', '2019.10'))
+        with self.assertRaises(ValueError):
+            risk.applicable_to_version('2016.01')
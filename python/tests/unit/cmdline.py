@@ -0,0 +1,168 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Depthcharge: <https://github.com/nccgroup/depthcharge>
+#
+# Relax style and documentation requirements for unit tests.
+# pylint: disable=missing-function-docstring,missing-class-docstring,too-few-public-methods
+#
+
+"""
+Unit tests for depthcharge.cmdline
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+
+from unittest import TestCase
+
+from depthcharge.cmdline import ArgumentParser, KeyValListAction, ListAction
+
+
+class TestArgumentParserSniff(TestCase):
+
+    def test_absent_args_default(self):
+        parser = ArgumentParser(sniff=True)
+        args = parser.parse_args(['-A'])
+
+        self.assertTrue(args.allow_deploy)
+        self.assertFalse(args.skip_deploy)
+        self.assertFalse(args.allow_reboot)
+        self.assertIsNone(args.arch)
+        self.assertIsNone(args.companion)
+
+    def test_clustered_short_options(self):
+        parser = ArgumentParser(sniff=True)
+        args = parser.parse_args(['-AR'])
+
+        self.assertTrue(args.allow_deploy)
+        self.assertTrue(args.allow_reboot)
+        self.assertFalse(args.skip_deploy)
+
+    def test_reparse(self):
+        parser = ArgumentParser(sniff=True)
+        parser.parse_args([])
+
+        args = parser.parse_args(['-R', '--arch', 'arm'])
+        self.assertTrue(args.allow_reboot)
+        self.assertEqual(args.arch, 'arm')
+
+    def test_usage_after_parse(self):
+        parser = ArgumentParser(sniff=True)
+        parser.parse_args([])
+
+        usage = parser.format_usage()
+        for opt in ('--arch', '-C', '-A', '-S', '-R'):
+            with self.subTest(opt):
+                self.assertIn(opt, usage)
+
+    def test_error_usage(self):
+        parser = ArgumentParser(sniff=True)
+
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr), self.assertRaises(SystemExit):
+            parser.parse_args(['--bogus'])
+
+        self.assertIn('[-R]', stderr.getvalue())
+
+    def test_fromfile_prefix_chars(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'args.txt')
+            with open(filename, 'w') as outfile:
+                outfile.write('-R\n')
+
+            parser = ArgumentParser(sniff=True, fromfile_prefix_chars='@')
+            args = parser.parse_args(['@' + filename])
+            self.assertTrue(args.allow_reboot)
+
+
+class TestArgumentParserInitArgs(TestCase):
+
+    def test_added_method(self):
+        class Parser(ArgumentParser):
+            pass
+
+        def add_foo_argument(self, **kwargs):
+            self.add_argument('--foo', **kwargs)
+
+        Parser.add_foo_argument = add_foo_argument
+
+        parser = Parser(init_args=['foo'], foo_default='bar')
+        self.assertEqual(parser.parse_args([]).foo, 'bar')
+
+    def test_invalid_name(self):
+        with self.assertRaises(AttributeError):
+            ArgumentParser(init_args=['bogus'])
+
+    def test_interface_kwargs(self):
+        parser = ArgumentParser(init_args=['interface'], interface_action='store')
+        args = parser.parse_args(['-i', '/dev/ttyS0:9600'])
+        self.assertEqual(vars(args), {'iface': '/dev/ttyS0:9600'})
+
+
+class TestListAction(TestCase):
+
+    @staticmethod
+    def _create_parser(default=None):
+        parser = ArgumentParser(init_args=None)
+        parser.add_argument('--op', action=ListAction, default=default)
+        return parser
+
+    def test_repeated(self):
+        parser = self._create_parser()
+        args = parser.parse_args(['--op', 'foo,bar', '--op', 'baz'])
+        self.assertEqual(args.op, ['foo', 'bar', 'baz'])
+
+    def test_empty_entries(self):
+        parser = self._create_parser()
+        args = parser.parse_args(['--op', ',foo,, bar ,', '--op', ','])
+        self.assertEqual(args.op, ['foo', 'bar'])
+
+        args = parser.parse_args(['--op', ','])
+        self.assertIsNone(args.op)
+
+    def test_default_not_modified(self):
+        default = ['default']
+        parser = self._create_parser(default)
+
+        args = parser.parse_args(['--op', 'foo'])
+        self.assertEqual(args.op, ['default', 'foo'])
+
+        args = parser.parse_args(['--op', 'bar'])
+        self.assertEqual(args.op, ['default', 'bar'])
+
+        args = parser.parse_args([])
+        self.assertEqual(args.op, ['default'])
+        self.assertEqual(default, ['default'])
+
+
+class TestKeyValListAction(TestCase):
+
+    @staticmethod
+    def _create_parser(default=None):
+        parser = ArgumentParser(init_args=None)
+        parser.add_argument('-X', '--extra', action=KeyValListAction, default=default)
+        return parser
+
+    def test_repeated(self):
+        parser = self._create_parser()
+        args = parser.parse_args(['-X', 'foo=bar,baz', '-X', 'hello=world', '-X', 'fortytwo'])
+        expected = {'foo': 'bar', 'baz': True, 'hello': 'world', 'fortytwo': True}
+        self.assertEqual(args.extra, expected)
+
+    def test_override(self):
+        parser = self._create_parser()
+        args = parser.parse_args(['-X', 'foo=bar', '-X', 'foo=baz'])
+        self.assertEqual(args.extra, {'foo': 'baz'})
+
+    def test_default_not_modified(self):
+        default = {'default': True}
+        parser = self._create_parser(default)
+
+        args = parser.parse_args(['-X', 'foo=bar'])
+        self.assertEqual(args.extra, {'default': True, 'foo': 'bar'})
+
+        args = parser.parse_args(['-X', 'baz'])
+        self.assertEqual(args.extra, {'default': True, 'baz': True})
+
+        self.assertEqual(default, {'default': True})
@@ -0,0 +1,143 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Depthcharge: <https://github.com/nccgroup/depthcharge>
+#
+# Relax style and documentation requirements for unit tests.
+# pylint: disable=missing-function-docstring,missing-class-docstring,too-few-public-methods
+#
+
+"""
+Unit tests for depthcharge.companion
+"""
+
+import os
+
+from unittest import TestCase, mock
+
+from depthcharge import companion, log
+
+
+class _FakeCompanionSerial:
+    """
+    Stand-in for a serial.Serial connection to Companion firmware.
+
+    Each write is recorded and may contain any number of requests, to which
+    responses are queued for subsequent reads. Opcodes listed in *fail* are
+    answered with a non-zero status.
+    """
+
+    fail = ()
+
+    def __init__(self, *args, **kwargs):
+        self.writes = []
+        self._pending = bytearray()
+
+    def write(self, data):
+        data = bytes(data)
+        self.writes.append(data)
+
+        i = 0
+        while i < len(data):
+            cmd, size = data[i], data[i + 1]
+            i += 2 + size
+
+            if cmd in self.fail:
+                resp = b'\x01'
+            elif cmd in (0x00, 0x01):  # get_version, get_capabilities
+                resp = b'\x01\x02\x03\x00'
+            elif cmd == 0x11:           # i2c_get_write_buffer
+                resp = b'abc'
+            else:
+                resp = b'\x00'
+
+            self._pending += bytes((cmd, len(resp))) + resp
+
+        return len(data)
+
+    def read(self, size):
+        data = bytes(self._pending[:size])
+        del self._pending[:size]
+        return data
+
+    def close(self):
+        pass
+
+
+class TestCompanionSendBatch(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls._old_log_level = log.get_level()
+        log.set_level(os.getenv('DEPTHCHARGE_LOG_LEVEL', log.ERROR))
+
+    @classmethod
+    def tearDownClass(cls):
+        log.set_level(cls._old_log_level)
+
+    def setUp(self):
+        env = {k: v for k, v in os.environ.items() if k != 'DEPTHCHARGE_COMPANION_CACHE'}
+        with mock.patch.dict(os.environ, env, clear=True), \
+             mock.patch.object(companion.serial, 'Serial', _FakeCompanionSerial):
+            self.companion = companion.Companion('/dev/fake')
+
+        self.ser = self.companion._ser  # pylint: disable=protected-access
+        self.ser.writes.clear()
+
+    def test_frame_boundaries(self):
+        # 2-byte header + 30-byte payload: two requests per 64-byte frame
+        items = [('i2c_set_read_buffer', bytes([i]) * 30, 1, b'\x00') for i in range(5)]
+        responses = self.companion.send_batch(items)
+
+        self.assertEqual(responses, [b'\x00'] * 5)
+        self.assertEqual([len(w) for w in self.ser.writes], [64, 64, 32])
+        self.assertEqual(b''.join(self.ser.writes),
+                         b''.join(b'\x10\x1e' + bytes([i]) * 30 for i in range(5)))
+
+    def test_oversized_request(self):
+        # A single maximum-size request exceeds the frame size and is sent on its own
+        items = [
+            ('i2c_set_addr', b'\x10', 1, b'\x00'),
+            ('i2c_set_read_buffer', b'\xaa' * 64, 1, b'\x00'),
+            ('i2c_set_addr', b'\x11', 1, b'\x00'),
+        ]
+        self.companion.send_batch(items)
+        self.assertEqual([len(w) for w in self.ser.writes], [3, 66, 3])
+
+    def test_per_item_responses(self):
+        items = [
+            ('i2c_set_addr', b'\x10'),
+            ('i2c_get_write_buffer', b'', range(0, 65)),
+            ('get_version', b'', 4),
+        ]
+        responses = self.companion.send_batch(items)
+
+        self.assertEqual(len(self.ser.writes), 1)
+        self.assertEqual(responses, [b'\x00', b'abc', b'\x01\x02\x03\x00'])
+
+    def test_item_failure(self):
+        self.ser.fail = (0x0b,)  # i2c_set_speed
+
+        items = [
+            ('i2c_set_addr', b'\x10', 1, b'\x00'),
+            ('i2c_set_speed', b'\x00\x00\x00\x01', 1, b'\x00'),
+            ('i2c_set_addr', b'\x11', 1, b'\x00'),
+        ]
+
+        with self.assertRaises(IOError):
+            self.companion.send_batch(items)
+
+        # Without an expected response, the status is simply returned
+        items = [(cmd_str, data) for (cmd_str, data, _, _) in items]
+        self.ser.read(64)  # Discard unread responses from the failed batch
+        self.assertEqual(self.companion.send_batch(items), [b'\x00', b'\x01', b'\x00'])
+
+    def test_invalid_request(self):
+        items = [
+            ('i2c_set_addr', b'\x10'),
+            ('i2c_set_read_buffer', b'\x00' * 65),
+        ]
+
+        # Nothing is sent if any request is invalid
+        with self.assertRaises(ValueError):
+            self.companion.send_batch(items)
+
+        self.assertEqual(self.ser.writes, [])
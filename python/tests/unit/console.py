@@ -0,0 +1,120 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Depthcharge: <https://github.com/nccgroup/depthcharge>
+#
+# Relax style and documentation requirements for unit tests.
+# pylint: disable=missing-function-docstring,missing-class-docstring,too-few-public-methods
+#
+
+"""
+Unit tests for depthcharge.console
+"""
+
+from unittest import TestCase, mock
+
+from depthcharge import console
+
+_PROMPT = b'=> '
+
+
+class _FakeConsoleSerial:
+    """
+    Stand-in for a serial.Serial connection to a U-Boot console.
+
+    Each line written is echoed back, followed by its output and a prompt.
+    The ``echo`` command prints its arguments, and ``hang`` never returns
+    to the prompt. Output is delivered in bursts of *burst_size* bytes,
+    each followed by an empty (timed out) read.
+    """
+
+    burst_size = 5
+
+    def __init__(self, *args, **kwargs):
+        self.writes = []
+        self.in_waiting = 0
+        self._pending = bytearray()
+        self._timed_out = False
+
+    def write(self, data):
+        data = bytes(data)
+        self.writes.append(data)
+
+        for line in data.splitlines():
+            self._pending += line + b'\r\n'
+            if line == b'hang':
+                continue
+
+            if line.startswith(b'echo '):
+                self._pending += line[5:] + b'\r\n'
+
+            self._pending += _PROMPT
+
+        return len(data)
+
+    def read(self, size):
+        if self._timed_out or not self._pending:
+            self._timed_out = False
+            return b''
+
+        self._timed_out = True
+        data = bytes(self._pending[:min(size, self.burst_size)])
+        del self._pending[:len(data)]
+        return data
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class TestConsoleSendCommandBatch(TestCase):
+
+    def setUp(self):
+        with mock.patch.object(console.serial, 'Serial', _FakeConsoleSerial):
+            self.console = console.Console('/dev/fake', prompt=_PROMPT.decode(), low_latency=False)
+
+        self.ser = self.console._ser  # pylint: disable=protected-access
+
+    def test_responses(self):
+        cmds = ['echo foo', 'version', 'echo bar\n']
+        responses = self.console.send_command_batch(cmds)
+        self.assertEqual(responses, ['foo\n', '', 'bar\n'])
+        self.assertEqual(self.ser.writes, [b'echo foo\nversion\necho bar\n'])
+
+    def test_split_prompt(self):
+        # Prompts straddle read boundaries for every burst size below
+        cmds = ['echo ' + str(i) for i in range(4)]
+        expected = [str(i) + '\n' for i in range(4)]
+
+        for burst_size in (1, 2, 3, 4, 7):
+            with self.subTest(burst_size):
+                self.ser.burst_size = burst_size
+                self.assertEqual(self.console.send_command_batch(cmds), expected)
+
+    def test_write_groups(self):
+        # 31 bytes per newline-terminated command: two commands per 64-byte write
+        cmds = ['echo ' + chr(ord('a') + i) * 25 for i in range(5)]
+        responses = self.console.send_command_batch(cmds)
+
+        self.assertEqual(responses, [cmd[5:] + '\n' for cmd in cmds])
+        self.assertEqual([len(w) for w in self.ser.writes], [62, 62, 31])
+
+        # An over-sized command is sent on its own
+        self.ser.writes.clear()
+        cmds = ['version', 'echo ' + 'x' * 64, 'version']
+        self.console.send_command_batch(cmds)
+        self.assertEqual([len(w) for w in self.ser.writes], [8, 70, 8])
+
+    def test_empty(self):
+        self.assertEqual(self.console.send_command_batch([]), [])
+        self.assertEqual(self.ser.writes, [])
+
+    def test_missing_response(self):
+        with self.assertRaises(IOError):
+            self.console.send_command_batch(['version', 'hang', 'version'])
+
+    def test_prompt_in_output(self):
+        # Detected when the additional prompts arrive along with the expected ones
+        self.ser.burst_size = 1024
+        with self.assertRaises(IOError):
+            self.console.send_command_batch(['echo ' + _PROMPT.decode(), 'version'])
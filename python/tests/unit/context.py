@@ -0,0 +1,194 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Depthcharge: <https://github.com/nccgroup/depthcharge>
+#
+# Relax style and documentation requirements for unit tests.
+# pylint: disable=missing-function-docstring,missing-class-docstring,too-few-public-methods
+#
+
+"""
+Unit tests for depthcharge.context
+"""
+
+import os
+
+from unittest import TestCase
+
+from depthcharge import log
+from depthcharge.context import Depthcharge
+from depthcharge.memory import MemoryPatch
+
+
+class _StubMemoryAccess:
+    """
+    Stand-in for both a MemoryReader and MemoryWriter, operating upon a
+    bytearray. Each operation is recorded, along with its keyword arguments.
+    """
+
+    def __init__(self, mem):
+        self.mem = mem
+        self.reads = []
+        self.writes = []
+
+    def read(self, address, size, **kwargs):
+        self.reads.append((address, size, kwargs))
+        return bytes(self.mem[address:address + size])
+
+    def write(self, address, data, **kwargs):
+        self.writes.append((address, data, kwargs))
+        self.mem[address:address + len(data)] = data
+
+
+class _StubOperationSet:
+    def __init__(self, impl):
+        self._impl = impl
+
+    def default(self, **_kwargs):
+        return self._impl
+
+    def find(self, _name):
+        return self._impl
+
+
+def _create_ctx():
+    # The constructor requires a console attached to a target
+    ctx = Depthcharge.__new__(Depthcharge)
+    ctx._progress_owner = None  # pylint: disable=protected-access
+    return ctx
+
+
+class TestDepthchargePatchMemory(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls._old_log_level = log.get_level()
+        log.set_level(os.getenv('DEPTHCHARGE_LOG_LEVEL', log.ERROR))
+
+    @classmethod
+    def tearDownClass(cls):
+        log.set_level(cls._old_log_level)
+
+    # pylint: disable=protected-access
+    def setUp(self):
+        self.mem = bytearray(range(256)) * 2
+        self.access = _StubMemoryAccess(self.mem)
+
+        self.ctx = _create_ctx()
+        self.ctx._memrd = _StubOperationSet(self.access)
+        self.ctx._memwr = _StubOperationSet(self.access)
+
+    def _patch(self, address, size, check=True):
+        expected = bytes(self.mem[address:address + size])
+        value = bytes(b ^ 0xff for b in expected)
+        desc = 'Patch @ {:d}'.format(address)
+        return MemoryPatch(address, value, expected if check else None, desc)
+
+    def _read_ranges(self):
+        return [(address, size) for (address, size, _) in self.access.reads]
+
+    def test_contiguous(self):
+        # Adjacent and overlapping patches are verified in a single read
+        patches = [self._patch(0, 4), self._patch(4, 4), self._patch(6, 4), self._patch(20, 4)]
+        self.ctx.patch_memory(patches)
+
+        self.assertEqual(self._read_ranges(), [(0, 10), (20, 4)])
+        self.assertEqual([w[0] for w in self.access.writes], [0, 4, 6, 20])
+
+    def test_gapped(self):
+        # Patches are grouped in list order, and those without an expected value are not read
+        patches = [self._patch(300, 4), self._patch(0, 4), self._patch(50, 2, check=False),
+                   self._patch(10, 4), self._patch(100, 8)]
+        self.ctx.patch_memory(patches, dry_run=True)
+
+        self.assertEqual(self._read_ranges(), [(300, 4), (0, 4), (10, 4), (100, 8)])
+        self.assertEqual(self.access.writes, [])
+
+    def test_check_max_gap(self):
+        patches = [self._patch(0, 4), self._patch(10, 4), self._patch(100, 8), self._patch(300, 4)]
+        self.ctx.patch_memory(patches, check_max_gap=86)
+
+        self.assertEqual(self._read_ranges(), [(0, 108), (300, 4)])
+
+        # Setup and teardown are only requested for the first and last read, respectively
+        suppress = [(kw['suppress_setup'], kw['suppress_teardown']) for (_, _, kw) in self.access.reads]
+        self.assertEqual(suppress, [(False, True), (True, False)])
+
+        # Not forwarded to the memory writer
+        self.assertEqual(len(self.access.writes), 4)
+        for (_, _, kwargs) in self.access.writes:
+            self.assertNotIn('check_max_gap', kwargs)
+
+    def test_check_max_gap_skip_checks(self):
+        patches = [self._patch(0, 4), self._patch(10, 4)]
+        self.ctx.patch_memory(patches, check_max_gap=16, skip_checks=True)
+
+        self.assertEqual(self.access.reads, [])
+        for (_, _, kwargs) in self.access.writes:
+            self.assertNotIn('check_max_gap', kwargs)
+
+    def test_mismatch(self):
+        patches = [self._patch(0, 4), self._patch(8, 4)]
+        self.mem[9] ^= 0x55
+
+        with self.assertRaises(ValueError):
+            self.ctx.patch_memory(patches, check_max_gap=4)
+
+        self.assertEqual(self.access.writes, [])
+
+    def test_already_patched(self):
+        patches = [self._patch(0, 4), self._patch(8, 4)]
+        self.ctx.patch_memory(patches)
+        self.assertEqual(len(self.access.writes), 2)
+
+        self.access.reads.clear()
+        self.access.writes.clear()
+
+        self.ctx.patch_memory(patches)
+        self.assertEqual(self._read_ranges(), [(0, 4), (8, 4)])
+        self.assertEqual(self.access.writes, [])
+
+
+class TestDepthchargeSetEnvVars(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls._old_log_level = log.get_level()
+        log.set_level(os.getenv('DEPTHCHARGE_LOG_LEVEL', log.ERROR))
+
+    @classmethod
+    def tearDownClass(cls):
+        log.set_level(cls._old_log_level)
+
+    def setUp(self):
+        self.ops = []
+        self.ctx = _create_ctx()
+        self.ctx.send_command = lambda cmd, **kwargs: self.ops.append(cmd) or ''
+        self.ctx.environment = lambda cached=True: self.ops.append(('environment', cached))
+
+    def test_ordering(self):
+        self.ctx.set_env_vars({'foo': 'bar baz', 'addr': 0x10, 'abc': '123'})
+
+        expected = [
+            'setenv foo bar baz',
+            'setenv addr 0x00000010',
+            'setenv abc 123',
+            ('environment', False)
+        ]
+        self.assertEqual(self.ops, expected)
+
+    def test_invalidate_cache(self):
+        self.ctx.set_env_vars({'foo': '1', 'bar': '2'}, invalidate_cache=False)
+        self.assertEqual(self.ops, ['setenv foo 1', 'setenv bar 2'])
+
+        self.ops.clear()
+        self.ctx.set_env_vars({})
+        self.assertEqual(self.ops, [])
+
+        self.ctx.set_env_var('foo', 'bar')
+        self.assertEqual(self.ops, ['setenv foo bar', ('environment', False)])
+
+    def test_invalid_value(self):
+        # Nothing is set if any value is invalid
+        with self.assertRaises(TypeError):
+            self.ctx.set_env_vars({'foo': 'bar', 'baz': 1.5})
+
+        self.assertEqual(self.ops, [])
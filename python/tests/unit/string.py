@@ -16,7 +16,35 @@ import tempfile
 from unittest import TestCase
 
 # TODO: Add test cases for other conversion fns
-from depthcharge.string import xxd, xxd_reverse, xxd_reverse_file
+from depthcharge.string import length_to_int, xxd, xxd_reverse, xxd_reverse_file
+
+
+class TestLengthToInt(TestCase):
+
+    def test_suffixes(self):
+        expected = {
+            '4096':     4096,
+            '0x1000':   0x1000,
+            '2kB':      2000,
+            '2K':       2048,
+            '2 KiB':    2048,
+            '3MB':      3 * 1000 * 1000,
+            '3m':       3 * 1024 * 1024,
+            '0x3MiB':   3 * 1024 * 1024,
+            '1GB':      1000 * 1000 * 1000,
+            '1G':       1024 * 1024 * 1024,
+            '1GiB':     1024 * 1024 * 1024,
+        }
+
+        for len_str, value in expected.items():
+            with self.subTest(len_str):
+                self.assertEqual(length_to_int(len_str), value)
+
+    def test_invalid(self):
+        for len_str in ('', 'K', '12Q', '1KBB'):
+            with self.subTest(len_str):
+                with self.assertRaises((ValueError, SystemExit)):
+                    length_to_int(len_str)
 
 
 class TestXxd(TestCase):